@@ -1,36 +1,174 @@
 """The Rumpke Waste Collection integration."""
 from __future__ import annotations
 
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.typing import ConfigType
+import voluptuous as vol
 
-from .const import DOMAIN, CONF_ZIP_CODE, CONF_SERVICE_DAY
-from .coordinator import RumpkeDataCoordinator
+from .api import RateLimiter, set_rate_limiter
+from .const import (
+    CONF_ADDRESSES,
+    CONF_BURST,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_STALENESS,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_SERVICE_DAY,
+    CONF_ZIP_CODE,
+    DEFAULT_BURST,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_STALENESS_HOURS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DOMAIN,
+)
+from .coordinator import RumpkeDataCoordinator, async_get_alerts_coordinator
+from .fleet import RumpkeFleetCoordinator
+from .ics import RumpkeIcsView
+from .parse_cache import async_get_parse_cache
+from .region_cache import async_get_region_cache
+from .region_schedules import async_get_region_schedules
+from .snapshot import SnapshotStore
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_REQUESTS_PER_SECOND, default=DEFAULT_REQUESTS_PER_SECOND
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01)),
+                vol.Optional(CONF_BURST, default=DEFAULT_BURST): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the rate limit shared by all entries, and the ICS feeds."""
+    hass.http.register_view(RumpkeIcsView())
+
+    if DOMAIN in config:
+        conf = config[DOMAIN]
+        set_rate_limiter(
+            async_get_clientsession(hass),
+            RateLimiter(
+                conf[CONF_REQUESTS_PER_SECOND],
+                conf[CONF_BURST],
+                conf[CONF_MAX_CONCURRENT_REQUESTS],
+            ),
+        )
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Rumpke from a config entry."""
+    if CONF_ADDRESSES in entry.data:
+        return await async_setup_fleet_entry(hass, entry)
+
     zip_code = entry.data[CONF_ZIP_CODE]
     service_day = entry.data[CONF_SERVICE_DAY]
+    max_staleness = timedelta(
+        hours=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS_HOURS)
+    )
 
     session = async_get_clientsession(hass)
-    coordinator = RumpkeDataCoordinator(hass, session, zip_code, service_day)
+    region_cache = await async_get_region_cache(hass)
+    parse_cache = await async_get_parse_cache(hass)
+    alerts = async_get_alerts_coordinator(hass, session, parse_cache)
+    schedules = async_get_region_schedules(hass, session, region_cache, parse_cache)
+    coordinator = RumpkeDataCoordinator(
+        hass,
+        session,
+        zip_code,
+        service_day,
+        region_cache,
+        alerts,
+        SnapshotStore(hass, entry.entry_id),
+        max_staleness,
+        parse_cache,
+        schedules,
+    )
+    entry.async_on_unload(
+        alerts.async_add_listener(coordinator.async_handle_alerts_update)
+    )
+    entry.async_on_unload(alerts.async_track_service_day(service_day))
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    await _async_first_refresh(hass, entry, coordinator)
 
     # Store coordinator for platforms to access
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
 
+async def async_setup_fleet_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a fleet entry's addresses with one coordinator."""
+    max_staleness = timedelta(
+        hours=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS_HOURS)
+    )
+
+    session = async_get_clientsession(hass)
+    region_cache = await async_get_region_cache(hass)
+    parse_cache = await async_get_parse_cache(hass)
+    alerts = async_get_alerts_coordinator(hass, session, parse_cache)
+    schedules = async_get_region_schedules(hass, session, region_cache, parse_cache)
+    coordinator = RumpkeFleetCoordinator(
+        hass,
+        entry.data[CONF_ADDRESSES],
+        schedules,
+        alerts,
+        SnapshotStore(hass, entry.entry_id),
+        max_staleness,
+    )
+    entry.async_on_unload(
+        alerts.async_add_listener(coordinator.async_handle_alerts_update)
+    )
+    for service_day in {address.service_day for address in coordinator.addresses.values()}:
+        entry.async_on_unload(alerts.async_track_service_day(service_day))
+
+    await _async_first_refresh(hass, entry, coordinator)
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    return True
+
+
+async def _async_first_refresh(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: RumpkeDataCoordinator | RumpkeFleetCoordinator,
+) -> None:
+    """
+    Serve the last snapshot right away and revalidate it in the background.
+
+    Only falls back to waiting on Rumpke's website when there isn't one.
+    """
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} revalidate {coordinator.log_name}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -39,3 +177,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's persisted snapshot."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
@@ -1,21 +1,87 @@
 """Parser for Rumpke service alerts."""
 from __future__ import annotations
 
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
 import logging
 import re
-from datetime import datetime
 from typing import Any
 
-from bs4 import BeautifulSoup
+try:
+    from .parser_engines import Section, extract_sections
+except ImportError:
+    from parser_engines import Section, extract_sections
 
 _LOGGER = logging.getLogger(__name__)
 
+# State abbreviation -> section heading name on the alerts page
+STATE_NAMES = {
+    "OH": "Ohio",
+    "KY": "Kentucky",
+    "IN": "Indiana",
+    "WV": "West Virginia",
+    "IL": "Illinois",
+}
+
+
+@dataclass(frozen=True)
+class ServiceAlert:
+    """A county service alert, with its week resolved to real dates."""
+
+    text: str
+    has_delay: bool
+    delay_days: int
+    alert_type: str
+    # Raw "week of" text (e.g., "jan. 26"), None if the alert names no week
+    week_of: str | None = None
+    # Monday-Sunday of the affected week, None if week_of couldn't be parsed
+    week_start: date | None = None
+    week_end: date | None = None
+
+    def applies_to(self, pickup_date: date) -> bool:
+        """Return True if the alert's delay applies to a scheduled pickup."""
+        if self.week_of is None:
+            # No week specified - apply to all pickups (rare case)
+            return True
+        if self.week_start is None:
+            # If we can't parse, don't apply the delay (safer to skip than incorrectly delay all weeks)
+            return False
+        return self.week_start <= pickup_date <= self.week_end
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-safe dict."""
+        data = asdict(self)
+        for key in ("week_start", "week_end"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ServiceAlert:
+        """Build from as_dict() output."""
+        data = dict(data)
+        for key in ("week_start", "week_end"):
+            if data.get(key):
+                data[key] = date.fromisoformat(data[key])
+        return cls(**data)
+
+
+def alert_key(county: str, state: str) -> tuple[str, str]:
+    """Return the index key for a county's alert."""
+    return (state, county.lower())
+
 
 class ServiceAlertsParser:
     """Parser for Rumpke service alerts HTML."""
 
     @staticmethod
-    def parse(html: str, county: str, state: str) -> dict[str, Any] | None:
+    def parse(
+        html: str,
+        county: str,
+        state: str,
+        fetched: date | None = None,
+        engine: str | None = None,
+    ) -> ServiceAlert | None:
         """
         Parse service alerts for a specific county.
 
@@ -23,48 +89,77 @@ class ServiceAlertsParser:
             html: Service alerts page HTML
             county: County name (e.g., "Delaware")
             state: State abbreviation (e.g., "OH")
+            fetched: Date the page was fetched, used to infer the alert's year
+            engine: HTML engine to use, default the fastest installed
 
         Returns:
-            Alert data dict or None if no alert for this county
+            ServiceAlert or None if no alert for this county
         """
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Find the state section
-        state_map = {"OH": "Ohio", "KY": "Kentucky", "IN": "Indiana", "WV": "West Virginia", "IL": "Illinois"}
-        state_name = state_map.get(state)
-
-        if not state_name:
+        if state not in STATE_NAMES:
             _LOGGER.warning("Unknown state: %s", state)
             return None
 
-        # Look for accordion sections with county data
-        accordion = soup.find_all("div", class_="repeatable-content")
+        alert = ServiceAlertsParser.parse_all(html, fetched, engine).get(alert_key(county, state))
+        if alert is None:
+            _LOGGER.debug("No service alert found for %s County, %s", county, state)
+        return alert
 
-        for section in accordion:
-            # Check if this section contains the state name
-            heading = section.find_previous("h3")
-            if not heading or state_name.lower() not in heading.get_text().lower():
-                continue
+    @staticmethod
+    def parse_all(
+        html: str, fetched: date | None = None, engine: str | None = None
+    ) -> dict[tuple[str, str], ServiceAlert]:
+        """
+        Parse every county alert on the page.
 
-            # Found the right state section, now look for the county
-            list_items = section.find_all("li")
+        Returns an index of alert_key(county, state) -> ServiceAlert. When a
+        county is listed more than once the first item wins.
+        """
+        if fetched is None:
+            fetched = datetime.now().date()
 
-            for item in list_items:
-                text = item.get_text(strip=True)
+        index: dict[tuple[str, str], ServiceAlert] = {}
 
-                # Check if this is our county
-                if text.lower().startswith(f"{county.lower()}:"):
-                    _LOGGER.debug("Found alert for %s County, %s: %s", county, state, text)
+        # Look for accordion sections with county data
+        for section in extract_sections(html, engine):
+            ServiceAlertsParser._index_section(section, fetched, index)
 
-                    # Parse the alert details
-                    alert = ServiceAlertsParser._parse_alert_text(text)
-                    return alert
+        return index
 
-        _LOGGER.debug("No service alert found for %s County, %s", county, state)
-        return None
+    @staticmethod
+    def _section_states(section: Section) -> list[str]:
+        """Return the states a section belongs to, from the heading before it."""
+        if section.heading is None:
+            return []
+        heading_text = section.heading.lower()
+        return [abbr for abbr, name in STATE_NAMES.items() if name.lower() in heading_text]
 
     @staticmethod
-    def _parse_alert_text(text: str) -> dict[str, Any]:
+    def _index_section(
+        section: Section, fetched: date, index: dict[tuple[str, str], ServiceAlert]
+    ) -> None:
+        """Add a section's county alerts to the index, keeping existing ones."""
+        # Work out which state this section belongs to from its heading
+        states = ServiceAlertsParser._section_states(section)
+        if not states:
+            return
+
+        for text in section.items:
+            if ":" not in text:
+                continue
+
+            county = text.split(":", 1)[0]
+            alert = None
+            for state in states:
+                key = alert_key(county, state)
+                if key in index:
+                    continue
+                if alert is None:
+                    _LOGGER.debug("Found alert for %s County, %s: %s", county, state, text)
+                    alert = ServiceAlertsParser._parse_alert_text(text, fetched)
+                index[key] = alert
+
+    @staticmethod
+    def _parse_alert_text(text: str, fetched: date) -> ServiceAlert:
         """Parse alert text to extract delay information."""
         # Remove county prefix (e.g., "Delaware:" or "Hamilton County:")
         clean_text = re.sub(r"^[^:]+:\s*", "", text)
@@ -92,10 +187,49 @@ class ServiceAlertsParser:
         week_match = re.search(r"week of (\w+\.?\s+\d+)", text_lower)
         week_of = week_match.group(1) if week_match else None
 
-        return {
-            "text": clean_text,
-            "has_delay": has_delay,
-            "delay_days": delay_days,
-            "alert_type": alert_type,
-            "week_of": week_of,
-        }
+        week_start = week_end = None
+        if week_of:
+            week_date = ServiceAlertsParser._resolve_week_of(week_of, fetched)
+            if week_date:
+                # The week_of date might be mid-week, so find the Monday of that week
+                week_start = week_date - timedelta(days=week_date.weekday())
+                week_end = week_start + timedelta(days=6)
+
+        return ServiceAlert(
+            text=clean_text,
+            has_delay=has_delay,
+            delay_days=delay_days,
+            alert_type=alert_type,
+            week_of=week_of,
+            week_start=week_start,
+            week_end=week_end,
+        )
+
+    @staticmethod
+    def _resolve_week_of(week_of: str, fetched: date) -> date | None:
+        """
+        Turn a week_of string (e.g., "jan. 26") into a date.
+
+        The page gives no year, so use the one that puts the date closest to
+        when the page was fetched ("dec. 29" read on Jan. 2 is last year).
+        """
+        # Clean up the string; strptime doesn't recognize "Sept"
+        week_str = re.sub(r"^sept\b", "sep", week_of.strip().replace(".", "")).title()
+        for fmt in ("%b %d", "%B %d"):
+            try:
+                # Parse against a leap year so "Feb 29" is accepted
+                parsed = datetime.strptime(f"{week_str} 2000", f"{fmt} %Y")
+                break
+            except ValueError:
+                continue
+        else:
+            _LOGGER.warning("Failed to parse week_of '%s' - skipping delay for this alert", week_of)
+            return None
+
+        candidates = []
+        for year in (fetched.year - 1, fetched.year, fetched.year + 1):
+            try:
+                candidates.append(date(year, parsed.month, parsed.day))
+            except ValueError:
+                continue
+        return min(candidates, key=lambda candidate: abs(candidate - fetched))
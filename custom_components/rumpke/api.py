@@ -1,47 +1,481 @@
 """API client for Rumpke."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import hashlib
 import logging
-from typing import Any
+import random
+import time
+from typing import Any, TypeVar
+from urllib.parse import urlencode, urlsplit
+import weakref
 
 import aiohttp
 from bs4 import BeautifulSoup
 
 try:
-    from .const import API_BASE_URL, API_GET_REGION, REGION_SCHEDULE_MAP, SERVICE_ALERTS_URL
+    from .const import (
+        API_BASE_URL,
+        API_GET_REGION,
+        BREAKER_COOLDOWN,
+        BREAKER_FAILURE_THRESHOLD,
+        BREAKER_MAX_COOLDOWN,
+        DEFAULT_BURST,
+        DEFAULT_MAX_CONCURRENT_REQUESTS,
+        DEFAULT_REQUESTS_PER_SECOND,
+        REGION_SCHEDULE_MAP,
+        REQUEST_TIMEOUT,
+        RETRY_ATTEMPTS,
+        RETRY_BACKOFF,
+        RETRY_BACKOFF_MAX,
+        SERVICE_ALERTS_URL,
+    )
 except ImportError:
-    from const import API_BASE_URL, API_GET_REGION, REGION_SCHEDULE_MAP, SERVICE_ALERTS_URL
+    from const import (
+        API_BASE_URL,
+        API_GET_REGION,
+        BREAKER_COOLDOWN,
+        BREAKER_FAILURE_THRESHOLD,
+        BREAKER_MAX_COOLDOWN,
+        DEFAULT_BURST,
+        DEFAULT_MAX_CONCURRENT_REQUESTS,
+        DEFAULT_REQUESTS_PER_SECOND,
+        REGION_SCHEDULE_MAP,
+        REQUEST_TIMEOUT,
+        RETRY_ATTEMPTS,
+        RETRY_BACKOFF,
+        RETRY_BACKOFF_MAX,
+        SERVICE_ALERTS_URL,
+    )
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+@dataclass
+class FetchResult:
+    """Result of a conditional page fetch.
+
+    html is None when the server answered 304 Not Modified.
+    """
+
+    html: str | None
+    content_hash: str
+    changed: bool
+
+
+@dataclass
+class _Response:
+    """The parts of an HTTP response the client uses, shareable between callers."""
+
+    status: int
+    body: Any = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class RequestCoalescer:
+    """Shares one in-flight request between concurrent identical callers."""
+
+    def __init__(self) -> None:
+        """Initialize the coalescer."""
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.stats = {"requests": 0, "coalesced": 0}
+
+    async def run(self, key: Hashable, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Return the result of request(), or of the identical one already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["requests"] += 1
+            task = self._inflight[key] = asyncio.ensure_future(request())
+            task.add_done_callback(lambda done: self._async_done(key, done))
+        else:
+            self.stats["coalesced"] += 1
+            _LOGGER.debug("Joining in-flight request %s", key)
+        # Shield it so one caller being cancelled doesn't cancel it for the others
+        return await asyncio.shield(task)
+
+    def _async_done(self, key: Hashable, task: asyncio.Future) -> None:
+        """Forget a finished request."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved, every caller may have given up on it
+            task.exception()
+
+
+# One coalescer per session, so every client sharing Home Assistant's session shares requests
+_coalescers: weakref.WeakKeyDictionary[aiohttp.ClientSession, RequestCoalescer] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_coalescer(session: aiohttp.ClientSession) -> RequestCoalescer:
+    """Return the request coalescer for a session."""
+    coalescer = _coalescers.get(session)
+    if coalescer is None:
+        coalescer = _coalescers[session] = RequestCoalescer()
+    return coalescer
+
+
+class _Deadline:
+    """A timeout that stands still while its requests wait in a rate limiter."""
+
+    def __init__(self, timeout: asyncio.Timeout) -> None:
+        """Initialize the deadline, running."""
+        self.timeout = timeout
+        self.active = True
+        self._paused = 0
+        self._remaining = 0.0
+
+    def pause(self) -> None:
+        """Stop the clock while a request waits its turn."""
+        self._paused += 1
+        when = self.timeout.when()
+        if self._paused > 1 or not self.active or when is None or self.timeout.expired():
+            return
+        self._remaining = when - asyncio.get_running_loop().time()
+        self.timeout.reschedule(None)
+
+    def resume(self) -> None:
+        """Restart the clock once no request is waiting."""
+        self._paused -= 1
+        if self._paused or not self.active or self.timeout.when() is not None:
+            return
+        self.timeout.reschedule(asyncio.get_running_loop().time() + self._remaining)
+
+
+# The deadline of the timeout_excluding_queue() the current task is in
+_deadline: ContextVar[_Deadline | None] = ContextVar(f"{__name__}.deadline", default=None)
+
+
+@asynccontextmanager
+async def timeout_excluding_queue(delay: float) -> AsyncIterator[None]:
+    """
+    Like asyncio.timeout(), but not counting time spent waiting in a RateLimiter.
+
+    A busy request queue then delays the work inside rather than failing it.
+    """
+    async with asyncio.timeout(delay) as timeout:
+        deadline = _Deadline(timeout)
+        token = _deadline.set(deadline)
+        try:
+            yield
+        finally:
+            deadline.active = False
+            _deadline.reset(token)
+
+
+class RateLimiter:
+    """Token bucket and concurrency cap for outbound requests.
+
+    Requests are let through at rate per second on average, with bursts of
+    up to burst, and at most max_concurrent at a time. Requests over the
+    limit wait their turn in arrival order rather than failing.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = DEFAULT_BURST,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize the limiter with a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # asyncio locks and semaphores wake waiters first come, first served
+        self._bucket = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.queued = 0
+        self.stats = {
+            "requests": 0,
+            "delayed": 0,
+            "max_queue_depth": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a token and a free slot, holding the slot for the block."""
+        start = time.monotonic()
+        self.queued += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queued)
+        deadline = _deadline.get()
+        if deadline is not None:
+            deadline.pause()
+        try:
+            async with self._bucket:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+            if deadline is not None:
+                deadline.resume()
+
+        wait = time.monotonic() - start
+        self.stats["requests"] += 1
+        if wait > 0.001:
+            self.stats["delayed"] += 1
+        self.stats["total_wait"] += wait
+        self.stats["max_wait"] = max(self.stats["max_wait"], wait)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter's settings and queue for diagnostics."""
+        requests = self.stats["requests"]
+        return {
+            "requests_per_second": self.rate,
+            "burst": self.burst,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.queued,
+            **self.stats,
+            "total_wait": round(self.stats["total_wait"], 3),
+            "max_wait": round(self.stats["max_wait"], 3),
+            "average_wait": round(self.stats["total_wait"] / requests, 3) if requests else 0.0,
+        }
+
+
+# One limiter per session, so every client sharing Home Assistant's session shares it
+_limiters: weakref.WeakKeyDictionary[aiohttp.ClientSession, RateLimiter] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_rate_limiter(session: aiohttp.ClientSession) -> RateLimiter:
+    """Return the rate limiter for a session."""
+    limiter = _limiters.get(session)
+    if limiter is None:
+        limiter = _limiters[session] = RateLimiter()
+    return limiter
+
+
+def set_rate_limiter(session: aiohttp.ClientSession, limiter: RateLimiter) -> None:
+    """Replace the rate limiter for a session, for clients created after this."""
+    _limiters[session] = limiter
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host after repeated failures.
+
+    After failure_threshold consecutive failed requests the breaker opens
+    and requests fail fast for cooldown. Then one request is let through:
+    if it succeeds the breaker closes, otherwise it opens again for twice
+    as long, up to max_cooldown.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN.total_seconds(),
+        max_cooldown: float = BREAKER_MAX_COOLDOWN.total_seconds(),
+    ) -> None:
+        """Initialize the breaker, closed."""
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.times_opened = 0
+        self.cooldown = cooldown
+        self._open_until = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() < self._open_until:
+                return False
+            self.state = "half_open"
+            self._probing = False
+        # Half open: only one request probes the host
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a request got through."""
+        if self.state != "closed":
+            _LOGGER.info("%s is responding again", self.host)
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self._probing = False
+
+    def release(self) -> None:
+        """Let another request probe the host, after one ended without an outcome."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker past the threshold."""
+        self.failures += 1
+        if self.state == "half_open":
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        elif self.failures < self.failure_threshold:
+            return
+
+        self.state = "open"
+        self.times_opened += 1
+        self._open_until = time.monotonic() + self.cooldown
+        self._probing = False
+        _LOGGER.warning(
+            "%s failed %d requests in a row, not contacting it for %d seconds",
+            self.host,
+            self.failures,
+            self.cooldown,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker's state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "retry_in": max(0, round(self._open_until - time.monotonic()))
+            if self.state == "open"
+            else 0,
+        }
+
+
+# One set of breakers per session, so every client sharing a session sees a host as down
+_breakers: weakref.WeakKeyDictionary[aiohttp.ClientSession, dict[str, CircuitBreaker]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_breaker(session: aiohttp.ClientSession, host: str) -> CircuitBreaker:
+    """Return the circuit breaker for a host."""
+    breakers = _breakers.setdefault(session, {})
+    breaker = breakers.get(host)
+    if breaker is None:
+        breaker = breakers[host] = CircuitBreaker(host)
+    return breaker
+
+
+def get_breakers(session: aiohttp.ClientSession) -> dict[str, CircuitBreaker]:
+    """Return every circuit breaker for a session, by host."""
+    return _breakers.get(session, {})
+
 
 class RumpkeApiClient:
     """API client for Rumpke waste collection."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
-        """Initialize the API client."""
+    def __init__(self, session: aiohttp.ClientSession, region_cache: Any = None) -> None:
+        """Initialize the API client.
+
+        region_cache is an optional RegionCache used to avoid repeating
+        get-region lookups for zips we have already resolved.
+        """
         self.session = session
+        self.region_cache = region_cache
+        self.coalescer = get_coalescer(session)
+        self.limiter = get_rate_limiter(session)
+
+        # ETag / Last-Modified / body hash of the last response per URL
+        self._validators: dict[str, dict[str, Any]] = {}
+        self.stats = {
+            "not_modified": 0,
+            "unchanged": 0,
+            "bytes_saved": 0,
+            "retries": 0,
+            "failed_requests": 0,
+            "short_circuited": 0,
+        }
 
     async def get_region(self, zip_code: str) -> dict[str, Any] | None:
         """Get region information for a zip code."""
+        if self.region_cache is not None:
+            hit, cached = self.region_cache.get(zip_code)
+            if hit:
+                _LOGGER.debug("Using cached region for %s: %s", zip_code, cached)
+                return cached
+
         url = f"{API_BASE_URL}{API_GET_REGION}"
         params = {"zipCode": zip_code}
 
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    _LOGGER.debug("Region data for %s: %s", zip_code, data)
-                    return data
-                else:
-                    _LOGGER.error("Failed to get region: HTTP %s", response.status)
-                    return None
+            response = await self._request(url, params, as_json=True)
+            if response.status == 200:
+                data = response.body
+                _LOGGER.debug("Region data for %s: %s", zip_code, data)
+                if self.region_cache is not None:
+                    # Zips outside the service area are cached as negative entries
+                    in_area = isinstance(data, dict) and data.get("region")
+                    data = data if in_area else None
+                    self.region_cache.set(zip_code, data)
+                return data
+            else:
+                _LOGGER.error("Failed to get region: HTTP %s", response.status)
+                return None
+        except CircuitOpenError as e:
+            _LOGGER.debug("Not looking up region for zip %s: %s", zip_code, e)
+            return None
         except Exception as e:
             _LOGGER.error("Error getting region for zip %s: %s", zip_code, e)
             return None
 
     async def get_holiday_schedule_html(self, zip_code: str) -> str | None:
         """Get holiday schedule HTML for a zip code."""
+        result = await self.fetch_holiday_schedule(zip_code, conditional=False)
+        return result.html if result else None
+
+    async def fetch_holiday_schedule(
+        self, zip_code: str, conditional: bool = True
+    ) -> FetchResult | None:
+        """Fetch the holiday schedule, revalidating against the last response."""
+        url = await self._holiday_schedule_url(zip_code)
+        if url is None:
+            return None
+
+        try:
+            result = await self._fetch(url, {"zip": zip_code}, conditional)
+            if result is not None:
+                _LOGGER.debug("Retrieved holiday schedule from %s", url)
+                return result
+        except CircuitOpenError as e:
+            # The site is down, the cached region is fine
+            _LOGGER.debug("Not fetching holiday schedule: %s", e)
+            return None
+        except Exception as e:
+            _LOGGER.error("Error getting holiday schedule: %s", e)
+
+        # The cached region may be stale, look it up again next time
+        if self.region_cache is not None:
+            self.region_cache.invalidate(zip_code)
+        return None
+
+    async def _holiday_schedule_url(self, zip_code: str) -> str | None:
+        """Return the holiday schedule page for a zip's region."""
         # First get the region to determine the correct schedule page
         region_data = await self.get_region(zip_code)
         if not region_data or "region" not in region_data:
@@ -53,35 +487,184 @@ class RumpkeApiClient:
 
         if not schedule_path:
             _LOGGER.error("No schedule path found for region %s", region)
+            if self.region_cache is not None:
+                self.region_cache.invalidate(zip_code)
             return None
 
-        url = f"{API_BASE_URL}{schedule_path}"
-        params = {"zip": zip_code}
-
-        try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    _LOGGER.debug("Retrieved holiday schedule for region %s", region)
-                    return html
-                else:
-                    _LOGGER.error("Failed to get holiday schedule: HTTP %s", response.status)
-                    return None
-        except Exception as e:
-            _LOGGER.error("Error getting holiday schedule: %s", e)
-            return None
+        return f"{API_BASE_URL}{schedule_path}"
 
     async def get_service_alerts_html(self) -> str | None:
         """Get service alerts HTML."""
+        result = await self.fetch_service_alerts(conditional=False)
+        return result.html if result else None
+
+    async def fetch_service_alerts(self, conditional: bool = True) -> FetchResult | None:
+        """Fetch the service alerts page, revalidating against the last response."""
         try:
-            async with self.session.get(SERVICE_ALERTS_URL) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    _LOGGER.debug("Retrieved service alerts")
-                    return html
-                else:
-                    _LOGGER.error("Failed to get service alerts: HTTP %s", response.status)
-                    return None
+            result = await self._fetch(SERVICE_ALERTS_URL, None, conditional)
+            if result is not None:
+                _LOGGER.debug("Retrieved service alerts")
+            return result
+        except CircuitOpenError as e:
+            _LOGGER.debug("Not fetching service alerts: %s", e)
+            return None
         except Exception as e:
             _LOGGER.error("Error getting service alerts: %s", e)
             return None
+
+    async def _fetch(
+        self, url: str, params: dict[str, str] | None, conditional: bool
+    ) -> FetchResult | None:
+        """
+        GET a page, sending the stored ETag / Last-Modified validators.
+
+        Returns a FetchResult with changed=False when the server answers 304
+        or the body hashes to the same value as last time, or None on HTTP
+        errors.
+        """
+        key = url if not params else f"{url}?{urlencode(sorted(params.items()))}"
+        validators = self._validators.get(key, {})
+
+        headers = {}
+        if conditional:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = await self._request(url, params, headers)
+        if response.status == 304 and validators:
+            self.stats["not_modified"] += 1
+            self.stats["bytes_saved"] += validators.get("size", 0)
+            _LOGGER.debug("%s not modified", key)
+            return FetchResult(None, validators["hash"], changed=False)
+
+        if response.status != 200:
+            _LOGGER.error("Failed to get %s: HTTP %s", url, response.status)
+            return None
+
+        html = response.body
+        content_hash = hashlib.sha256(html.encode()).hexdigest()
+        changed = content_hash != validators.get("hash")
+        if not changed:
+            self.stats["unchanged"] += 1
+
+        self._validators[key] = {
+            "etag": response.etag,
+            "last_modified": response.last_modified,
+            "hash": content_hash,
+            "size": len(html),
+        }
+        return FetchResult(html, content_hash, changed)
+
+    async def _request(
+        self,
+        url: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        as_json: bool = False,
+    ) -> _Response:
+        """GET a URL, sharing the request with identical concurrent callers."""
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+            as_json,
+        )
+        return await self.coalescer.run(
+            key, lambda: self._send_with_retries(url, params, headers, as_json)
+        )
+
+    async def _send_with_retries(
+        self,
+        url: str,
+        params: dict[str, str] | None,
+        headers: dict[str, str] | None,
+        as_json: bool,
+    ) -> _Response:
+        """
+        GET a URL, retrying timeouts, connection errors and 5xx/429 answers.
+
+        Every attempt waits its turn in the rate limiter; the timeout only
+        starts once it is sent. Retries back off exponentially with full
+        jitter. Requests to a host whose circuit breaker is open raise
+        CircuitOpenError without being sent; the last response or error is
+        returned once retries run out.
+        """
+        breaker = get_breaker(self.session, urlsplit(url).netloc)
+        if not breaker.allow():
+            self.stats["short_circuited"] += 1
+            raise CircuitOpenError(f"{breaker.host} is not responding")
+
+        # Every way out records an outcome or releases the probe, so a
+        # request that errors unexpectedly or is cancelled can't wedge a
+        # half open breaker
+        settled = False
+        try:
+            for attempt in range(RETRY_ATTEMPTS):
+                error: Exception | None = None
+                try:
+                    async with self.limiter.slot(), asyncio.timeout(REQUEST_TIMEOUT):
+                        response = await self._send(url, params, headers, as_json)
+                except aiohttp.ContentTypeError:
+                    # The host answered, just not with what we asked for
+                    settled = True
+                    breaker.record_success()
+                    raise
+                except (aiohttp.ClientError, TimeoutError) as e:
+                    error = e
+                else:
+                    if response.status < 500 and response.status != 429:
+                        settled = True
+                        breaker.record_success()
+                        return response
+
+                if attempt + 1 == RETRY_ATTEMPTS:
+                    break
+                delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2**attempt))
+                self.stats["retries"] += 1
+                _LOGGER.debug(
+                    "Retrying %s in %.1f seconds after %s",
+                    url,
+                    delay,
+                    repr(error) if error else f"HTTP {response.status}",
+                )
+                await asyncio.sleep(delay)
+
+            settled = True
+            self.stats["failed_requests"] += 1
+            breaker.record_failure()
+        except Exception:
+            if not settled:
+                # An unreadable answer, such as a body that doesn't decode
+                settled = True
+                self.stats["failed_requests"] += 1
+                breaker.record_failure()
+            raise
+        finally:
+            if not settled:
+                # Cancelled, with nothing learned about the host
+                breaker.release()
+
+        if error is not None:
+            raise error
+        return response
+
+    async def _send(
+        self,
+        url: str,
+        params: dict[str, str] | None,
+        headers: dict[str, str] | None,
+        as_json: bool,
+    ) -> _Response:
+        """GET a URL and read the response."""
+        async with self.session.get(url, params=params, headers=headers) as response:
+            if response.status != 200:
+                return _Response(response.status)
+            body = await (response.json() if as_json else response.text())
+            return _Response(
+                response.status,
+                body,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
@@ -1,18 +1,23 @@
 """Calendar platform for Rumpke."""
 from __future__ import annotations
 
-from datetime import timedelta
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from itertools import takewhile
 import logging
+from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, CONF_ZIP_CODE
 from .coordinator import RumpkeDataCoordinator
-from .utils import calculate_next_pickup, generate_pickup_dates
+from .fleet import FleetAddress, RumpkeFleetCoordinator, fleet_device_info
+from .timeline import Pickup, iter_pickups
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,18 +29,64 @@ async def async_setup_entry(
 ) -> None:
     """Set up Rumpke calendar."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(coordinator, RumpkeFleetCoordinator):
+        async_add_entities(
+            RumpkePickupCalendar(address, entry) for address in coordinator.addresses.values()
+        )
+        return
+
     async_add_entities([RumpkePickupCalendar(coordinator, entry)])
 
 
+def pickup_event(coordinator: RumpkeDataCoordinator, pickup: Pickup) -> CalendarEvent:
+    """Convert a pickup to a calendar event."""
+    description = f"Service day: {coordinator.service_day}"
+    if pickup.reasons:
+        description += f"\nDelayed by: {', '.join(pickup.reasons)}"
+
+    return CalendarEvent(
+        summary="Rumpke Pickup",
+        start=pickup.date,
+        end=pickup.date + timedelta(days=1),
+        uid=f"rumpke_{pickup.date.isoformat()}_{coordinator.event_id}",
+        description=description,
+    )
+
+
 class RumpkePickupCalendar(CalendarEntity):
     """Calendar entity for Rumpke pickup dates."""
 
-    def __init__(self, coordinator: RumpkeDataCoordinator, entry: ConfigEntry) -> None:
+    def __init__(
+        self, coordinator: RumpkeDataCoordinator | FleetAddress, entry: ConfigEntry
+    ) -> None:
         """Initialize the calendar."""
         self.coordinator = coordinator
+        # Skipped writes are counted on the coordinator that refreshes the data
+        self._data_coordinator = (
+            coordinator.fleet if isinstance(coordinator, FleetAddress) else coordinator
+        )
+        self._attr_has_entity_name = True
+        # The coordinator pushes updates on its own schedule
+        self._attr_should_poll = False
+        # Availability and event last written
+        self._written: tuple[bool, CalendarEvent | None] | None = None
+
+        # Events for one contiguous range of dates, built from the data and
+        # date in _events_version; extended as ranges next to it are requested
+        self._events: list[CalendarEvent] = []
+        self._event_dates: list[date] = []
+        self._events_range: tuple[date, date] | None = None
+        self._events_version: tuple[dict[str, Any], date] | None = None
+
+        if isinstance(coordinator, FleetAddress):
+            # One of many addresses on the fleet's device
+            self._attr_name = f"{coordinator.label} Pickup Schedule"
+            self._attr_unique_id = f"rumpke_{entry.entry_id}_{coordinator.key}_calendar"
+            self._attr_device_info = fleet_device_info(entry)
+            return
+
         self._attr_name = "Pickup Schedule"
         self._attr_unique_id = f"rumpke_{entry.data[CONF_ZIP_CODE]}_calendar"
-        self._attr_has_entity_name = True
 
         # Link to same device as sensor
         self._attr_device_info = DeviceInfo(
@@ -49,72 +100,100 @@ class RumpkePickupCalendar(CalendarEntity):
     @property
     def event(self) -> CalendarEvent | None:
         """Return current/next event (determines calendar state)."""
-        if not self.coordinator.data:
+        timeline = self.coordinator.timeline
+        if timeline is None or timeline.next_pickup is None:
             return None
 
-        # Get next pickup date
-        next_date = calculate_next_pickup(
-            self.coordinator.service_day,
-            self.coordinator.data.get("holidays", []),
-            self.coordinator.data.get("service_alert"),
-        )
-
-        if next_date:
-            return CalendarEvent(
-                summary="Rumpke Pickup",
-                start=next_date,
-                end=next_date + timedelta(days=1),
-                uid=f"rumpke_{next_date.isoformat()}_{self.coordinator.zip_code}",
-            )
-        return None
+        return self._to_event(timeline.next_pickup)
 
     async def async_get_events(
         self, hass: HomeAssistant, start_date, end_date
     ) -> list[CalendarEvent]:
         """Return calendar events within date range."""
-        if not self.coordinator.data:
+        timeline = self.coordinator.timeline
+        if timeline is None:
             return []
 
-        # Never generate events before today
-        from homeassistant.util import dt as dt_util
         today = dt_util.now().date()
-        effective_start = max(start_date.date(), today)
-
-        # Limit to 3 months of events (90 days)
-        max_end_date = effective_start + timedelta(days=90)
-        limited_end_date = min(end_date.date(), max_end_date)
-
-        # Generate all pickup dates in the range
-        pickup_dates = generate_pickup_dates(
-            self.coordinator.service_day,
-            self.coordinator.data.get("holidays", []),
-            self.coordinator.data.get("service_alert"),
-            effective_start,
-            limited_end_date,
-        )
+        start, end = start_date.date(), end_date.date()
+        if end < start:
+            return []
 
-        # Convert to CalendarEvent objects
-        events = []
-        for pickup_date in pickup_dates:
-            events.append(
-                CalendarEvent(
-                    summary="Rumpke Pickup",
-                    start=pickup_date,
-                    end=pickup_date + timedelta(days=1),
-                    uid=f"rumpke_{pickup_date.isoformat()}_{self.coordinator.zip_code}",
-                    description=f"Service day: {self.coordinator.service_day}",
+        self._extend_events(start, end, today)
+        return self._events[
+            bisect_left(self._event_dates, start):bisect_right(self._event_dates, end)
+        ]
+
+    def _extend_events(self, start: date, end: date, today: date) -> None:
+        """
+        Make sure the cached events cover start to end.
+
+        Only the dates not already covered are generated. The cache is
+        dropped when the coordinator has new data or the date rolls over,
+        or when the range asked for doesn't touch the cached one.
+        """
+        version = (self.coordinator.data, today)
+        cached = self._events_range
+        if (
+            cached is None
+            or self._events_version is None
+            or self._events_version[0] is not version[0]
+            or self._events_version[1] != today
+            or start > cached[1] + timedelta(days=1)
+            or end < cached[0] - timedelta(days=1)
+        ):
+            self._events = self._generate_events(start, end)
+            self._events_range = (start, end)
+            self._events_version = version
+        else:
+            if start < cached[0]:
+                self._events[:0] = self._generate_events(start, cached[0] - timedelta(days=1))
+            if end > cached[1]:
+                self._events.extend(self._generate_events(cached[1] + timedelta(days=1), end))
+            self._events_range = (min(start, cached[0]), max(end, cached[1]))
+        self._event_dates = [event.start for event in self._events]
+
+    def _generate_events(self, start: date, end: date) -> list[CalendarEvent]:
+        """Return events for the pickups from start to end inclusive."""
+        timeline = self.coordinator.timeline
+        if timeline.covers(start, end):
+            pickups = timeline.between(start, end)
+        else:
+            # Past weeks or beyond the precomputed horizon, generate just this window
+            pickups = list(
+                takewhile(
+                    lambda pickup: pickup.date <= end,
+                    iter_pickups(self.coordinator.service_day, self.coordinator.delay_index, start),
                 )
             )
 
-        return events
+        _LOGGER.debug("Generated %d calendar events from %s to %s", len(pickups), start, end)
+        return [self._to_event(pickup) for pickup in pickups]
+
+    def _to_event(self, pickup: Pickup) -> CalendarEvent:
+        """Convert a pickup to a calendar event."""
+        return pickup_event(self.coordinator, pickup)
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        # Last good data keeps being served through failed refreshes
+        return not self.coordinator.is_stale
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
+        # Home Assistant writes the initial state once this returns
+        self._written = (self.available, self.event)
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._async_handle_coordinator_update)
         )
+
+    @callback
+    def _async_handle_coordinator_update(self) -> None:
+        """Write the state, unless the event it is derived from is unchanged."""
+        written = (self.available, self.event)
+        if written == self._written:
+            self._data_coordinator.state_writes_suppressed += 1
+            return
+        self._written = written
+        self.async_write_ha_state()
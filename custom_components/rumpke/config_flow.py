@@ -1,18 +1,34 @@
 """Config flow for Rumpke Waste Collection."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterable
 import logging
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .const import DOMAIN, CONF_ZIP_CODE, CONF_SERVICE_DAY
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+from homeassistant.util import slugify
+
+from .const import (
+    CONF_ADDRESSES,
+    CONF_MAX_STALENESS,
+    CONF_SERVICE_DAY,
+    CONF_ZIP_CODE,
+    DEFAULT_MAX_STALENESS_HOURS,
+    DOMAIN,
+    FLEET_MAX_ZIP_LOOKUPS,
+)
 from .api import RumpkeApiClient
-from .utils import get_county_from_zip, get_city_from_zip
+from .executor import async_run_blocking
+from .fleet import parse_addresses
+from .region_cache import async_get_region_cache
+from .utils import lookup_zip
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,11 +41,20 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_FLEET_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): str,
+        vol.Required(CONF_ADDRESSES): TextSelector(TextSelectorConfig(multiline=True)),
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
     session = async_get_clientsession(hass)
-    api = RumpkeApiClient(session)
+    # Share the region cache so the first refresh doesn't repeat this lookup
+    region_cache = await async_get_region_cache(hass)
+    api = RumpkeApiClient(session, region_cache)
 
     # Verify the zip code is in Rumpke's service area
     region_data = await api.get_region(data[CONF_ZIP_CODE])
@@ -39,16 +64,13 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     # Get city/state from zip for better naming
     zip_code = data[CONF_ZIP_CODE]
-    city_info = get_city_from_zip(zip_code)
-    county_info = get_county_from_zip(zip_code)
+    zip_info = await async_run_blocking(hass, lookup_zip, zip_code)
 
     # Build title based on available information
-    if city_info:
-        city, state = city_info
-        title = f"Rumpke Waste & Recycling - {city}, {state} {zip_code}"
-    elif county_info:
-        county, state = county_info
-        title = f"Rumpke Waste & Recycling - {county} County, {state} {zip_code}"
+    if zip_info and zip_info.city:
+        title = f"Rumpke Waste & Recycling - {zip_info.city}, {zip_info.state} {zip_code}"
+    elif zip_info and zip_info.county:
+        title = f"Rumpke Waste & Recycling - {zip_info.county} County, {zip_info.state} {zip_code}"
     else:
         title = f"Rumpke Waste & Recycling - {region_data['region']} {zip_code}"
 
@@ -58,15 +80,69 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     }
 
 
+async def validate_fleet_zips(hass: HomeAssistant, zip_codes: Iterable[str]) -> list[str]:
+    """
+    Return the zip codes that aren't in Rumpke's service area.
+
+    Zips in the region cache aren't looked up again, and at most
+    FLEET_MAX_ZIP_LOOKUPS new ones are, so a long list doesn't keep the
+    flow waiting minutes on the rate limit. The rest are looked up on the
+    fleet's first refresh, which logs the ones outside the service area.
+    """
+    session = async_get_clientsession(hass)
+    region_cache = await async_get_region_cache(hass)
+    api = RumpkeApiClient(session, region_cache)
+
+    invalid = []
+    unknown = []
+    for zip_code in sorted(set(zip_codes)):
+        hit, region_data = region_cache.get(zip_code)
+        if not hit:
+            unknown.append(zip_code)
+        elif not region_data:
+            invalid.append(zip_code)
+
+    lookups = unknown[:FLEET_MAX_ZIP_LOOKUPS]
+    if len(unknown) > len(lookups):
+        _LOGGER.info(
+            "Checking %d of %d new zip codes now, the rest on the fleet's first refresh",
+            len(lookups),
+            len(unknown),
+        )
+
+    # Each zip is looked up once, paced by the shared rate limit
+    regions = await asyncio.gather(*(api.get_region(zip_code) for zip_code in lookups))
+    invalid.extend(
+        zip_code
+        for zip_code, region_data in zip(lookups, regions)
+        if not region_data or "region" not in region_data
+    )
+    return sorted(invalid)
+
+
 class RumpkeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Rumpke."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> RumpkeOptionsFlow:
+        """Get the options flow for this handler."""
+        return RumpkeOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["address", "fleet"])
+
+    async def async_step_address(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set up a single address."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -85,5 +161,73 @@ class RumpkeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="address", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_fleet(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set up many addresses, pasted as CSV, as one entry."""
+        errors: dict[str, str] = {}
+        placeholders = {"error": ""}
+
+        if user_input is not None:
+            try:
+                addresses = parse_addresses(user_input[CONF_ADDRESSES])
+                invalid = await validate_fleet_zips(
+                    self.hass, (address[CONF_ZIP_CODE] for address in addresses)
+                )
+            except ValueError as e:
+                errors["base"] = "invalid_addresses"
+                placeholders["error"] = str(e)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                if invalid:
+                    errors["base"] = "invalid_fleet_zips"
+                    placeholders["error"] = ", ".join(invalid)
+                else:
+                    await self.async_set_unique_id(f"fleet_{slugify(user_input[CONF_NAME])}")
+                    self._abort_if_unique_id_configured()
+
+                    return self.async_create_entry(
+                        title=user_input[CONF_NAME],
+                        data={CONF_NAME: user_input[CONF_NAME], CONF_ADDRESSES: addresses},
+                    )
+
+        return self.async_show_form(
+            step_id="fleet",
+            data_schema=self.add_suggested_values_to_schema(STEP_FLEET_DATA_SCHEMA, user_input),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+
+class RumpkeOptionsFlow(config_entries.OptionsFlow):
+    """Handle Rumpke options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_STALENESS,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS_HOURS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                }
+            ),
         )
@@ -1,4 +1,5 @@
 """Constants for the Rumpke Waste Collection integration."""
+from datetime import timedelta
 
 DOMAIN = "rumpke"
 
@@ -6,6 +7,17 @@ DOMAIN = "rumpke"
 CONF_ZIP_CODE = "zip_code"
 CONF_SERVICE_DAY = "service_day"
 
+# Fleet entries: many addresses, each a dict of zip code, service day and label
+CONF_ADDRESSES = "addresses"
+CONF_LABEL = "label"
+# Zip codes not seen before that setting up a fleet checks against the service
+# area; the rest are checked on the fleet's first refresh
+FLEET_MAX_ZIP_LOOKUPS = 20
+
+# Options
+CONF_MAX_STALENESS = "max_staleness"
+DEFAULT_MAX_STALENESS_HOURS = 72
+
 # API endpoints
 API_BASE_URL = "https://www.rumpke.com"
 API_GET_REGION = "/holiday-schedule/get-region"
@@ -27,3 +39,85 @@ SERVICE_ALERTS_URL = "https://www.rumpke.com/service-alerts"
 
 # Update intervals (in minutes)
 SCAN_INTERVAL_HOURS = 12
+
+# Holiday schedules change a few times a year; next year's is checked for
+# daily from HOLIDAY_PREFETCH_WINDOW before New Year to a week after
+HOLIDAY_SCAN_INTERVAL = timedelta(days=7)
+HOLIDAY_ROLLOVER_SCAN_INTERVAL = timedelta(days=1)
+HOLIDAY_PREFETCH_WINDOW = timedelta(days=21)
+# After a failed refresh, retried sooner, doubling per failure up to the max
+HOLIDAY_RETRY_INTERVAL = timedelta(minutes=15)
+HOLIDAY_RETRY_MAX_INTERVAL = timedelta(hours=4)
+
+# Service alerts are checked more often while one is active, and in winter
+# or around an entry's service day, when weather delays are likely
+ALERTS_QUIET_INTERVAL = timedelta(hours=24)
+ALERTS_WATCH_INTERVAL = timedelta(hours=3)
+ALERTS_ACTIVE_INTERVAL = timedelta(hours=1)
+WINTER_MONTHS = (12, 1, 2, 3)
+
+# Each entry refreshes at its own fixed point in the interval, give or take this
+REFRESH_JITTER = timedelta(minutes=15)
+
+# Per-source fetch timeouts (in seconds)
+SCHEDULE_FETCH_TIMEOUT = 30
+ALERTS_FETCH_TIMEOUT = 30
+
+# Each HTTP request, retried with jittered exponential backoff
+REQUEST_TIMEOUT = 8  # seconds
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 1.0  # seconds, doubled per attempt
+RETRY_BACKOFF_MAX = 8.0  # seconds
+
+# Circuit breaker per host: consecutive failed requests before it opens, and
+# how long it stays open before letting one request through to probe it
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN = timedelta(minutes=5)
+BREAKER_MAX_COOLDOWN = timedelta(hours=1)
+
+# Rate limit for all requests to Rumpke, shared by every entry; settable
+# under rumpke: in configuration.yaml
+CONF_REQUESTS_PER_SECOND = "requests_per_second"
+CONF_BURST = "burst"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_BURST = 5
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Storage
+STORAGE_VERSION = 1
+
+# Keys for shared objects in hass.data[DOMAIN]
+DATA_REGION_CACHE = "region_cache"
+DATA_ALERTS_COORDINATOR = "alerts_coordinator"
+DATA_EXECUTOR = "executor"
+DATA_PARSE_CACHE = "parse_cache"
+DATA_REGION_SCHEDULES = "region_schedules"
+
+# Region lookup cache
+REGION_CACHE_TTL = timedelta(days=30)
+REGION_CACHE_NEGATIVE_TTL = timedelta(days=1)
+REGION_CACHE_SAVE_DELAY = 10  # seconds
+
+# How long entries in a region share one fetch of its holiday schedule
+REGION_SCHEDULE_TTL = timedelta(hours=SCAN_INTERVAL_HOURS)
+
+# Coordinator data snapshot
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+
+# Worker threads for HTML parsing and zip lookups, shared by all entries
+EXECUTOR_MAX_WORKERS = 2
+
+# Days of pickups precomputed per data update
+TIMELINE_HORIZON_DAYS = 365
+
+# How long past service alerts are kept to show past weeks' pickups
+ALERT_HISTORY_RETENTION = timedelta(days=730)
+
+# Days of past pickups in the ICS feeds, before the timeline's upcoming ones
+ICS_PAST_DAYS = 90
+
+# Parse results kept in memory, and in storage, across all entries
+PARSE_CACHE_SIZE = 32
+PARSE_CACHE_DISK_SIZE = 16
+PARSE_CACHE_SAVE_DELAY = 10
@@ -1,23 +1,338 @@
 """Data coordinator for Rumpke."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+import functools
+import hashlib
 import logging
+import random
+import time
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant import config_entries
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 import aiohttp
 
-from .api import RumpkeApiClient
+from .api import FetchResult, RumpkeApiClient, timeout_excluding_queue
+from .executor import async_run_blocking
+from .parse_cache import ParseCache
 from .parser import HolidayScheduleParser
-from .alerts_parser import ServiceAlertsParser
-from .utils import get_county_from_zip
-from .const import SCAN_INTERVAL_HOURS
+from .alerts_parser import ServiceAlert, ServiceAlertsParser, alert_key
+from .region_cache import RegionCache
+from .region_schedules import RegionSchedules
+from .snapshot import SnapshotStore
+from .timeline import PickupTimeline, build_timeline
+from .utils import DAYS, DelayIndex, get_county_from_zip
+from .const import (
+    ALERT_HISTORY_RETENTION,
+    ALERTS_ACTIVE_INTERVAL,
+    ALERTS_FETCH_TIMEOUT,
+    ALERTS_QUIET_INTERVAL,
+    ALERTS_WATCH_INTERVAL,
+    DATA_ALERTS_COORDINATOR,
+    DEFAULT_MAX_STALENESS_HOURS,
+    DOMAIN,
+    HOLIDAY_PREFETCH_WINDOW,
+    HOLIDAY_RETRY_INTERVAL,
+    HOLIDAY_RETRY_MAX_INTERVAL,
+    HOLIDAY_ROLLOVER_SCAN_INTERVAL,
+    HOLIDAY_SCAN_INTERVAL,
+    REFRESH_JITTER,
+    SCHEDULE_FETCH_TIMEOUT,
+    WINTER_MONTHS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class RumpkeDataCoordinator(DataUpdateCoordinator):
+class PickupTimelineMixin:
+    """Delay index and pickup timeline for one address, cached per data object and day.
+
+    Needs data, service_day and zip_code on the class it is mixed into.
+    """
+
+    data: dict[str, Any] | None
+    service_day: str
+    zip_code: str
+
+    # Delay index and pickup timeline, and the data object they were built from
+    _delay_index: DelayIndex | None = None
+    _delay_index_data: dict[str, Any] | None = None
+    _delay_index_today: date | None = None
+    _timeline: PickupTimeline | None = None
+    _timeline_data: dict[str, Any] | None = None
+
+    @property
+    def event_id(self) -> str:
+        """Return what tells this address's calendar events apart from others'."""
+        return self.zip_code
+
+    @property
+    def delay_index(self) -> DelayIndex | None:
+        """
+        Return the holiday and alert delay index for the current data.
+
+        Past alerts only apply to weeks that are over; the current week is
+        left to the current alert, in case it has been withdrawn.
+        """
+        if not self.data:
+            return None
+
+        today = dt_util.now().date()
+        if (
+            self._delay_index is None
+            or self._delay_index_data is not self.data
+            or self._delay_index_today != today
+        ):
+            self._delay_index = DelayIndex(
+                self.data.get("holidays", []),
+                self.data.get("service_alert"),
+                [
+                    alert
+                    for alert in self.data.get("alert_history", ())
+                    if alert.week_end < today
+                ],
+            )
+            self._delay_index_data = self.data
+            self._delay_index_today = today
+        return self._delay_index
+
+    @property
+    def timeline(self) -> PickupTimeline | None:
+        """
+        Return the pickup timeline for the current data.
+
+        Rebuilt only when the data changes or the date rolls over.
+        """
+        if not self.data:
+            return None
+
+        today = dt_util.now().date()
+        timeline = self._timeline
+        if timeline is None or self._timeline_data is not self.data or timeline.today != today:
+            timeline = self._timeline = build_timeline(
+                self.service_day,
+                self.data.get("holidays", []),
+                self.data.get("service_alert"),
+                today,
+                delay_index=self.delay_index,
+            )
+            self._timeline_data = self.data
+            _LOGGER.debug(
+                "Built pickup timeline for %s: %d pickups through %s",
+                self.zip_code,
+                len(timeline.pickups),
+                timeline.end,
+            )
+        return timeline
+
+
+class EntryCoordinatorMixin:
+    """Refresh scheduling, staleness and snapshots for a config entry's coordinator.
+
+    Needs max_staleness and snapshot on the DataUpdateCoordinator it is
+    mixed into, which fetches its data in _async_fetch_data().
+    """
+
+    max_staleness: timedelta
+    snapshot: SnapshotStore | None
+
+    # Entity state writes skipped because nothing recorded had changed
+    state_writes_suppressed = 0
+    # Refreshes failed in a row, for backing off retries
+    _failed_refreshes = 0
+    _unsub_stale: CALLBACK_TYPE | None = None
+    _unsub_rollover: CALLBACK_TYPE | None = None
+
+    @property
+    def log_name(self) -> str:
+        """Return what names this coordinator in logs."""
+        return self.name
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch new data from Rumpke."""
+        raise NotImplementedError
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from Rumpke, retrying sooner than usual if that fails."""
+        self.update_interval = self._next_refresh_interval(
+            holiday_scan_interval(self.max_staleness)
+        )
+        try:
+            data = await self._async_fetch_data()
+        except Exception:
+            self._failed_refreshes += 1
+            self.update_interval = holiday_retry_interval(
+                self._failed_refreshes, self.update_interval
+            )
+            raise
+        self._failed_refreshes = 0
+        return data
+
+    def _next_refresh_interval(self, scan_interval: timedelta) -> timedelta:
+        """
+        Return the time until this entry's next refresh slot, with jitter.
+
+        Entries created together would otherwise refresh together forever.
+        Instead each gets a fixed phase within the scan interval, derived
+        from its entry id so it survives restarts, which spreads entries
+        evenly over the interval. The delay is between half and one and a
+        half intervals, give or take the jitter.
+        """
+        interval = scan_interval.total_seconds()
+        key = self.config_entry.entry_id if self.config_entry else self.log_name
+        phase = int(hashlib.sha256(key.encode()).hexdigest()[:8], 16) / 2**32 * interval
+
+        now = time.time()
+        delay = (phase - now) % interval
+        if delay < interval / 2:
+            # Too soon after this refresh, wait for the slot after
+            delay += interval
+        jitter = min(REFRESH_JITTER.total_seconds(), interval / 4)
+        return timedelta(seconds=delay + random.uniform(-jitter, jitter))
+
+    async def async_restore_snapshot(self) -> bool:
+        """
+        Serve the persisted snapshot, if there is one that isn't too stale.
+
+        Returns True if data was restored; the caller should then revalidate
+        it in the background instead of blocking setup on a refresh.
+        """
+        if self.snapshot is None:
+            return False
+
+        data = await self.snapshot.async_load()
+        if data is None:
+            return False
+
+        age = datetime.now() - data["last_update"]
+        if age > self.max_staleness:
+            _LOGGER.debug("Snapshot for %s is %s old, not using it", self.log_name, age)
+            return False
+
+        self._restore_state(data)
+        _LOGGER.debug("Restored %s old snapshot for %s", age, self.log_name)
+        self.async_set_updated_data(data)
+        self._async_data_stored(data, persist=False)
+        return True
+
+    def _restore_state(self, data: dict[str, Any]) -> None:
+        """Pick up what the next refresh builds on from restored data."""
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True if there is no data or it is older than max_staleness."""
+        if not self.data:
+            return True
+        return datetime.now() - self.data["last_update"] > self.max_staleness
+
+    @callback
+    def _async_data_stored(self, data: dict[str, Any], persist: bool = True) -> None:
+        """Persist new data and schedule the moment it goes stale, and the next midnight."""
+        if persist and self.snapshot is not None:
+            self.snapshot.async_save(data)
+
+        if self._unsub_stale:
+            self._unsub_stale()
+        delay = data["last_update"] + self.max_staleness - datetime.now()
+        self._unsub_stale = async_call_later(
+            self.hass, max(delay.total_seconds(), 0), self._async_went_stale
+        )
+
+        if self._unsub_rollover is None:
+            self._async_schedule_rollover()
+
+    @callback
+    def _async_schedule_rollover(self) -> None:
+        """Schedule the next local midnight, when the entities' values change."""
+        tomorrow = dt_util.now().date() + timedelta(days=1)
+        self._unsub_rollover = async_track_point_in_time(
+            self.hass, self._async_date_rolled_over, dt_util.start_of_local_day(tomorrow)
+        )
+
+    @callback
+    def _async_date_rolled_over(self, _now: datetime) -> None:
+        """
+        Recompute the entities from the data we have for the new day.
+
+        The next pickup and days until it only change at midnight, so this
+        keeps them exact without polling Rumpke. Timelines rebuild
+        themselves for the new date.
+        """
+        self._async_schedule_rollover()
+        _LOGGER.debug("Date rolled over, updating %s", self.log_name)
+        self.async_update_listeners()
+
+    @callback
+    def _async_went_stale(self, _now: datetime) -> None:
+        """Let entities know the data has gone stale."""
+        self._unsub_stale = None
+        _LOGGER.warning(
+            "No successful update for %s in %s, marking unavailable",
+            self.log_name,
+            self.max_staleness,
+        )
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the staleness and rollover timers along with any scheduled refresh."""
+        await super().async_shutdown()
+        for unsub in (self._unsub_stale, self._unsub_rollover):
+            if unsub:
+                unsub()
+        self._unsub_stale = self._unsub_rollover = None
+
+
+def holiday_scan_interval(max_staleness: timedelta) -> timedelta:
+    """
+    Return how often to poll the holiday schedule.
+
+    Rarely, except around New Year when next year's schedule comes out,
+    and always often enough that the data doesn't go stale.
+    """
+    today = dt_util.now().date()
+    if (
+        date(today.year + 1, 1, 1) - today <= HOLIDAY_PREFETCH_WINDOW
+        or today.timetuple().tm_yday <= 7
+    ):
+        interval = HOLIDAY_ROLLOVER_SCAN_INTERVAL
+    else:
+        interval = HOLIDAY_SCAN_INTERVAL
+    return min(interval, max_staleness / 2)
+
+
+def holiday_retry_interval(failures: int, scan_interval: timedelta) -> timedelta:
+    """
+    Return how soon to retry after failures refreshes in a row have failed.
+
+    Waiting the full scan interval could let the data go stale after one
+    failure, so retry sooner, backing off and with jitter so entries that
+    failed together don't retry together.
+    """
+    retry = min(HOLIDAY_RETRY_INTERVAL * 2 ** (failures - 1), HOLIDAY_RETRY_MAX_INTERVAL)
+    return min(retry * random.uniform(0.5, 1), scan_interval)
+
+
+def updated_alert_history(
+    history: tuple[ServiceAlert, ...], service_alert: ServiceAlert | None
+) -> tuple[ServiceAlert, ...]:
+    """Return an alert history with service_alert added and old weeks dropped."""
+    cutoff = dt_util.now().date() - ALERT_HISTORY_RETENTION
+    kept = [alert for alert in history if alert.week_end >= cutoff]
+    if service_alert and service_alert.has_delay and service_alert.week_start is not None:
+        # A later alert for the same week replaces the earlier one
+        kept = [alert for alert in kept if alert.week_start != service_alert.week_start]
+        kept.append(service_alert)
+    return tuple(kept)
+
+
+class RumpkeDataCoordinator(PickupTimelineMixin, EntryCoordinatorMixin, DataUpdateCoordinator):
     """Data coordinator for Rumpke waste collection."""
 
     def __init__(
@@ -26,69 +341,370 @@ class RumpkeDataCoordinator(DataUpdateCoordinator):
         session: aiohttp.ClientSession,
         zip_code: str,
         service_day: str,
+        region_cache: RegionCache | None = None,
+        alerts: ServiceAlertsCoordinator | None = None,
+        snapshot: SnapshotStore | None = None,
+        max_staleness: timedelta = timedelta(hours=DEFAULT_MAX_STALENESS_HOURS),
+        parse_cache: ParseCache | None = None,
+        schedules: RegionSchedules | None = None,
     ) -> None:
         """Initialize the coordinator."""
-        self.api = RumpkeApiClient(session)
+        self.api = RumpkeApiClient(session, region_cache)
+        self.alerts = alerts
+        self.parse_cache = parse_cache
+        self.schedules = schedules
+        self.snapshot = snapshot
+        self.max_staleness = max_staleness
+
         self.zip_code = zip_code
         self.service_day = service_day
 
-        # Get county information for service alerts
-        county_info = get_county_from_zip(zip_code)
-        if county_info:
-            self.county, self.state = county_info
-            _LOGGER.info("Zip %s -> %s County, %s", zip_code, self.county, self.state)
-        else:
-            self.county = None
-            self.state = None
-            _LOGGER.warning("Could not determine county for zip %s", zip_code)
+        # Last parse per source, keyed by content hash of the page it came from
+        self._parsed: dict[str, tuple[str, Any]] = {}
+        self.parses_skipped = 0
+
+        # County information for service alerts, resolved on first refresh
+        self._county_resolved = False
+        self.county: str | None = None
+        self.state: str | None = None
 
         super().__init__(
             hass,
             _LOGGER,
             name="Rumpke Waste & Recycling",
-            update_interval=timedelta(hours=SCAN_INTERVAL_HOURS),
+            update_interval=holiday_scan_interval(self.max_staleness),
+        )
+
+    @property
+    def log_name(self) -> str:
+        """Return what names this coordinator in logs."""
+        return self.zip_code
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch the holidays and the shared alerts, and build the entry's data."""
+
+        # The schedule and the shared alerts index are independent, so wait
+        # on both at once; refresh latency is that of the slower one.
+        start = time.monotonic()
+        timings: dict[str, float] = {}
+        holidays, alerts_ready = await asyncio.gather(
+            self._async_timed(
+                timings, "holidays", self._async_fetch_holidays(), SCHEDULE_FETCH_TIMEOUT
+            ),
+            self._async_timed(
+                timings, "service_alerts", self._async_prepare_alerts(), ALERTS_FETCH_TIMEOUT
+            ),
+            return_exceptions=True,
         )
+        _LOGGER.debug(
+            "Refreshed %s in %.3fs (%s; sequential would take %.3fs)",
+            self.zip_code,
+            time.monotonic() - start,
+            ", ".join(f"{name} {elapsed:.3f}s" for name, elapsed in timings.items()),
+            sum(timings.values()),
+        )
+
+        if isinstance(holidays, UpdateFailed):
+            raise holidays
+        if isinstance(holidays, Exception):
+            raise UpdateFailed(f"Error fetching Rumpke data: {holidays}") from holidays
+        if isinstance(alerts_ready, Exception):
+            _LOGGER.warning("Service alerts not available: %s", alerts_ready)
+
+        # Look up service alerts in the shared index
+        service_alert = self._lookup_service_alert()
+
+        data = {
+            "holidays": holidays,
+            "service_alert": service_alert,
+            "alert_history": self._alert_history(service_alert),
+            "county": self.county,
+            "state": self.state,
+            "last_update": datetime.now(),
+        }
+        self._async_data_stored(data)
+        return data
+
+    def _restore_state(self, data: dict[str, Any]) -> None:
+        """Pick up the county the snapshot was built for."""
+        self.county = data.get("county")
+        self.state = data.get("state")
+        self._county_resolved = self.county is not None
+
+    def _alert_history(self, service_alert: ServiceAlert | None) -> tuple[ServiceAlert, ...]:
+        """Return the stored alert history with service_alert added."""
+        return updated_alert_history(
+            self.data.get("alert_history", ()) if self.data else (), service_alert
+        )
+
+    async def _async_timed(
+        self, timings: dict[str, float], name: str, awaitable: Awaitable[Any], timeout: float
+    ) -> Any:
+        """
+        Await one source with its own timeout, recording how long it took.
 
-    async def _async_update_data(self):
-        """Fetch data from Rumpke."""
+        Time spent queued behind other entries' requests in the rate limiter
+        doesn't count towards the timeout.
+        """
+        start = time.monotonic()
         try:
-            # Get holiday schedule
-            html = await self.api.get_holiday_schedule_html(self.zip_code)
-            if not html:
-                raise UpdateFailed("Failed to fetch holiday schedule")
-
-            holidays = HolidayScheduleParser.parse(html)
-            _LOGGER.debug("Parsed %d holidays", len(holidays))
-
-            # Get service alerts
-            service_alert = None
-            if self.county and self.state:
-                _LOGGER.debug("Fetching service alerts for %s County, %s", self.county, self.state)
-                alerts_html = await self.api.get_service_alerts_html()
-                if alerts_html:
-                    service_alert = ServiceAlertsParser.parse(alerts_html, self.county, self.state)
-                    if service_alert:
-                        _LOGGER.info(
-                            "Service alert for %s County, %s: %s (delay: %s days)",
-                            self.county,
-                            self.state,
-                            service_alert.get("alert_type"),
-                            service_alert.get("delay_days", 0),
-                        )
-                    else:
-                        _LOGGER.debug("No service alerts found for %s County, %s", self.county, self.state)
-                else:
-                    _LOGGER.warning("Failed to fetch service alerts HTML")
+            async with timeout_excluding_queue(timeout):
+                return await awaitable
+        except TimeoutError as err:
+            raise UpdateFailed(f"Timed out fetching {name}") from err
+        finally:
+            timings[name] = time.monotonic() - start
+
+    async def _async_fetch_holidays(self) -> list[dict[str, Any]]:
+        """Fetch and parse the holiday schedule."""
+        if self.schedules is not None:
+            holidays = await self.schedules.async_get_holidays(self.zip_code)
+            if holidays is not None:
+                _LOGGER.debug("Using %d holidays from the shared region schedule", len(holidays))
+                return holidays
+
+        holidays = await self._async_fetch_parsed(
+            "holidays",
+            lambda conditional: self.api.fetch_holiday_schedule(self.zip_code, conditional),
+            HolidayScheduleParser.parse,
+        )
+        _LOGGER.debug("Parsed %d holidays", len(holidays))
+        return holidays
+
+    async def _async_prepare_alerts(self) -> None:
+        """Resolve our county and wait for the shared alerts index's first fetch."""
+        if not self._county_resolved:
+            # The first lookup reads the zip index from disk, keep it off the event loop
+            county_info = await async_run_blocking(
+                self.hass, get_county_from_zip, self.zip_code
+            )
+            self._county_resolved = True
+            if county_info:
+                self.county, self.state = county_info
+                _LOGGER.info("Zip %s -> %s County, %s", self.zip_code, self.county, self.state)
             else:
-                _LOGGER.warning("County/state not available, cannot fetch service alerts")
+                _LOGGER.warning("Could not determine county for zip %s", self.zip_code)
+
+        if self.alerts is not None:
+            await self.alerts.async_wait_ready()
+
+    def _lookup_service_alert(self) -> ServiceAlert | None:
+        """Return this entry's alert from the shared alerts index."""
+        if not (self.county and self.state):
+            _LOGGER.warning("County/state not available, cannot look up service alerts")
+            return None
+
+        if self.alerts is None or self.alerts.data is None:
+            _LOGGER.warning("Service alerts not available")
+            return None
 
-            return {
-                "holidays": holidays,
+        service_alert = self.alerts.data.get(alert_key(self.county, self.state))
+        if service_alert:
+            _LOGGER.info(
+                "Service alert for %s County, %s: %s (delay: %s days)",
+                self.county,
+                self.state,
+                service_alert.alert_type,
+                service_alert.delay_days,
+            )
+        else:
+            _LOGGER.debug("No service alerts found for %s County, %s", self.county, self.state)
+        return service_alert
+
+    @callback
+    def async_handle_alerts_update(self) -> None:
+        """Pick up a new alerts index without waiting for our own refresh."""
+        if not self.data:
+            return
+
+        service_alert = self._lookup_service_alert()
+        if service_alert != self.data.get("service_alert"):
+            self.data = {
+                **self.data,
                 "service_alert": service_alert,
-                "county": self.county,
-                "state": self.state,
-                "last_update": datetime.now(),
+                "alert_history": self._alert_history(service_alert),
             }
+            if self.snapshot is not None:
+                self.snapshot.async_save(self.data)
+            self.async_update_listeners()
+
+    async def _async_fetch_parsed(
+        self,
+        key: str,
+        fetch: Callable[[bool], Awaitable[FetchResult | None]],
+        parse: Callable[[str], Any],
+    ) -> Any:
+        """
+        Fetch and parse a page, reusing the previous parse when it is unchanged.
+
+        The request is only made conditional once we hold a parse to fall
+        back on. Raises UpdateFailed if the page can't be fetched.
+        """
+        previous = self._parsed.get(key)
+        result = await fetch(previous is not None)
+        if result is None:
+            raise UpdateFailed(f"Failed to fetch {key}")
+
+        if previous and previous[0] == result.content_hash:
+            self.parses_skipped += 1
+            _LOGGER.debug("%s page unchanged, reusing previous parse", key)
+            return previous[1]
+
+        if self.parse_cache is not None:
+            # Another entry, or a previous run, may have parsed this page already
+            parsed = self.parse_cache.get(key, result.content_hash)
+            if parsed is not None:
+                self.parses_skipped += 1
+                _LOGGER.debug("%s page already parsed, reusing cached parse", key)
+                self._parsed[key] = (result.content_hash, parsed)
+                return parsed
 
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching Rumpke data: {err}")
+        if result.html is None:
+            # Not modified, but our parse is from an older copy of the page
+            result = await fetch(False)
+            if result is None or result.html is None:
+                raise UpdateFailed(f"Failed to fetch {key}")
+
+        if self.parse_cache is not None:
+            parsed = await self.parse_cache.async_parse(key, result.content_hash, result.html, parse)
+        else:
+            parsed = await async_run_blocking(self.hass, parse, result.html)
+        self._parsed[key] = (result.content_hash, parsed)
+        return parsed
+
+
+class ServiceAlertsCoordinator(DataUpdateCoordinator):
+    """Shared coordinator for the service alerts page.
+
+    The alerts page is global, so one instance per hass fetches it once per
+    interval and parses it into an alert_key -> alert index that every
+    entry coordinator looks up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        parse_cache: ParseCache | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        self.api = RumpkeApiClient(session)
+        self.parse_cache = parse_cache
+        self._content_hash: str | None = None
+        self._first_refresh: asyncio.Task | None = None
+        self.parses_skipped = 0
+        # Weekdays (0 = Monday) entries are picked up on, with how many entries each
+        self._service_days: Counter[int] = Counter()
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Rumpke Service Alerts",
+            update_interval=ALERTS_QUIET_INTERVAL,
+        )
+
+    @callback
+    def async_track_service_day(self, service_day: str) -> CALLBACK_TYPE:
+        """Poll more often around an entry's service day, until unsubscribed."""
+        weekday = DAYS[service_day]
+        self._service_days[weekday] += 1
+
+        @callback
+        def _async_untrack() -> None:
+            self._service_days[weekday] -= 1
+
+        return _async_untrack
+
+    def _scan_interval(self, index: dict[tuple[str, str], ServiceAlert] | None) -> timedelta:
+        """Return how often to poll, given the current alerts."""
+        today = dt_util.now().date()
+        if index and any(
+            alert.has_delay and (alert.week_end is None or alert.week_end >= today)
+            for alert in index.values()
+        ):
+            return ALERTS_ACTIVE_INTERVAL
+
+        # The day before a service day through the service day itself
+        if today.month in WINTER_MONTHS or any(
+            count and (today.weekday() - weekday) % 7 in (0, 6)
+            for weekday, count in self._service_days.items()
+        ):
+            return ALERTS_WATCH_INTERVAL
+        return ALERTS_QUIET_INTERVAL
+
+    @callback
+    def async_start(self) -> None:
+        """Start the first fetch in the background."""
+        if self._first_refresh is None:
+            self._first_refresh = self.hass.async_create_task(self.async_refresh())
+
+    async def async_wait_ready(self) -> None:
+        """Wait for the first fetch to finish, successfully or not."""
+        self.async_start()
+        # Shield it so one caller timing out doesn't cancel it for everyone
+        await asyncio.shield(self._first_refresh)
+
+    async def _async_update_data(self) -> dict[tuple[str, str], ServiceAlert]:
+        """Fetch and index the service alerts page."""
+        self.update_interval = self._scan_interval(self.data)
+        try:
+            async with asyncio.timeout(ALERTS_FETCH_TIMEOUT):
+                index = await self._async_fetch_index()
+        except TimeoutError as err:
+            raise UpdateFailed("Timed out fetching service alerts") from err
+
+        self.update_interval = self._scan_interval(index)
+        _LOGGER.debug("Next service alerts check in %s", self.update_interval)
+        return index
+
+    async def _async_fetch_index(self) -> dict[tuple[str, str], ServiceAlert]:
+        """Fetch the alerts page and parse it if it changed."""
+        result = await self.api.fetch_service_alerts(conditional=self.data is not None)
+        if result is None:
+            raise UpdateFailed("Failed to fetch service alerts")
+
+        if self.data is not None and result.content_hash == self._content_hash:
+            self.parses_skipped += 1
+            _LOGGER.debug("Service alerts unchanged, reusing previous index")
+            return self.data
+
+        if result.html is None:
+            result = await self.api.fetch_service_alerts(conditional=False)
+            if result is None or result.html is None:
+                raise UpdateFailed("Failed to fetch service alerts")
+
+        # Alert weeks carry no year, resolve them against today's date
+        today = dt_util.now().date()
+        parse = functools.partial(ServiceAlertsParser.parse_all, fetched=today)
+        if self.parse_cache is not None:
+            # The parse depends on the date too, so only reuse it the same day
+            index = await self.parse_cache.async_parse(
+                "alerts", f"{result.content_hash}:{today}", result.html, parse
+            )
+        else:
+            index = await async_run_blocking(self.hass, parse, result.html)
+        self._content_hash = result.content_hash
+        _LOGGER.debug("Indexed %d county service alerts", len(index))
+        return index
+
+
+@callback
+def async_get_alerts_coordinator(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    parse_cache: ParseCache | None = None,
+) -> ServiceAlertsCoordinator:
+    """Return the shared service alerts coordinator, starting it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    alerts = domain_data.get(DATA_ALERTS_COORDINATOR)
+    if alerts is None:
+        # The hub outlives whichever entry happens to create it, so don't
+        # let it bind to that entry's lifecycle
+        token = config_entries.current_entry.set(None)
+        try:
+            alerts = ServiceAlertsCoordinator(hass, session, parse_cache)
+        finally:
+            config_entries.current_entry.reset(token)
+        domain_data[DATA_ALERTS_COORDINATOR] = alerts
+        alerts.async_start()
+    return alerts
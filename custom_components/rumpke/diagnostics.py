@@ -0,0 +1,77 @@
+"""Diagnostics support for Rumpke."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import get_breakers
+from .const import DOMAIN
+from .coordinator import RumpkeDataCoordinator
+from .fleet import RumpkeFleetCoordinator
+from .parser_engines import DEFAULT_ENGINE
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: RumpkeDataCoordinator | RumpkeFleetCoordinator = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+    if isinstance(coordinator, RumpkeFleetCoordinator):
+        return _fleet_diagnostics(coordinator)
+
+    return {
+        "entry": dict(entry.data),
+        "county": coordinator.county,
+        "state": coordinator.state,
+        "last_update_success": coordinator.last_update_success,
+        "is_stale": coordinator.is_stale,
+        "http": dict(coordinator.api.stats),
+        "coalesced_requests": dict(coordinator.api.coalescer.stats),
+        "rate_limiter": coordinator.api.limiter.as_dict(),
+        "circuit_breakers": {
+            host: breaker.as_dict()
+            for host, breaker in get_breakers(coordinator.api.session).items()
+        },
+        "parses_skipped": coordinator.parses_skipped,
+        "state_writes_suppressed": coordinator.state_writes_suppressed,
+        "parser_engine": DEFAULT_ENGINE,
+        "parse_cache": dict(coordinator.parse_cache.stats) if coordinator.parse_cache else None,
+        "region_schedules": dict(coordinator.schedules.stats) if coordinator.schedules else None,
+        "service_alerts": {
+            "last_update_success": coordinator.alerts.last_update_success,
+            "counties": len(coordinator.alerts.data or {}),
+            "http": dict(coordinator.alerts.api.stats),
+            "parses_skipped": coordinator.alerts.parses_skipped,
+        },
+    }
+
+
+def _fleet_diagnostics(coordinator: RumpkeFleetCoordinator) -> dict[str, Any]:
+    """Return diagnostics for a fleet entry."""
+    api = coordinator.schedules.api
+    return {
+        "addresses": len(coordinator.addresses),
+        "zip_codes": coordinator.zip_codes,
+        "addresses_without_data": sorted(
+            address.label for address in coordinator.addresses.values() if address.data is None
+        ),
+        "last_update_success": coordinator.last_update_success,
+        "is_stale": coordinator.is_stale,
+        "http": dict(api.stats),
+        "rate_limiter": api.limiter.as_dict(),
+        "circuit_breakers": {
+            host: breaker.as_dict() for host, breaker in get_breakers(api.session).items()
+        },
+        "state_writes_suppressed": coordinator.state_writes_suppressed,
+        "region_schedules": dict(coordinator.schedules.stats),
+        "service_alerts": {
+            "last_update_success": coordinator.alerts.last_update_success,
+            "counties": len(coordinator.alerts.data or {}),
+        }
+        if coordinator.alerts
+        else None,
+    }
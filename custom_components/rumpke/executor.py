@@ -0,0 +1,68 @@
+"""Shared executor for blocking Rumpke work."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+import time
+from typing import Any, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DATA_EXECUTOR, DOMAIN, EXECUTOR_MAX_WORKERS
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@callback
+def async_get_executor(hass: HomeAssistant) -> ThreadPoolExecutor:
+    """Return the executor shared by all entries, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    executor = domain_data.get(DATA_EXECUTOR)
+    if executor is None:
+        executor = domain_data[DATA_EXECUTOR] = ThreadPoolExecutor(
+            max_workers=EXECUTOR_MAX_WORKERS, thread_name_prefix=DOMAIN
+        )
+
+        @callback
+        def _async_shutdown(_event: Event) -> None:
+            executor.shutdown(wait=False)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+    return executor
+
+
+async def async_run_blocking(
+    hass: HomeAssistant, func: Callable[..., _T], *args: Any
+) -> _T:
+    """
+    Run HTML parsing or zip database work off the event loop.
+
+    With debug logging enabled, each call logs how long it would have
+    blocked the event loop had it run inline.
+    """
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        func = _timed(func)
+    return await hass.loop.run_in_executor(async_get_executor(hass), func, *args)
+
+
+def _timed(func: Callable[..., _T]) -> Callable[..., _T]:
+    """Wrap func to log its run time."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any) -> _T:
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            _LOGGER.debug(
+                "%s would have blocked the event loop for %.1f ms",
+                getattr(func, "__qualname__", func),
+                (time.perf_counter() - start) * 1000,
+            )
+
+    return wrapper
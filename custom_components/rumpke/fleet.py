@@ -0,0 +1,308 @@
+"""Fleet entries: many addresses served by one coordinator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import csv
+from datetime import datetime, timedelta
+import io
+import logging
+import re
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import slugify
+
+from .alerts_parser import ServiceAlert, alert_key
+from .const import (
+    ALERTS_FETCH_TIMEOUT,
+    CONF_LABEL,
+    CONF_SERVICE_DAY,
+    CONF_ZIP_CODE,
+    DEFAULT_MAX_STALENESS_HOURS,
+    DOMAIN,
+)
+from .coordinator import (
+    EntryCoordinatorMixin,
+    PickupTimelineMixin,
+    ServiceAlertsCoordinator,
+    holiday_scan_interval,
+    updated_alert_history,
+)
+from .executor import async_run_blocking
+from .region_schedules import RegionSchedules
+from .snapshot import SnapshotStore
+from .utils import DAYS, get_county_from_zip
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_addresses(text: str) -> list[dict[str, str]]:
+    """
+    Parse pasted CSV lines of zip code, service day and an optional label.
+
+    A header line and blank lines are skipped. Raises ValueError naming
+    the first bad line.
+    """
+    addresses: list[dict[str, str]] = []
+    keys: set[str] = set()
+    for number, row in enumerate(csv.reader(io.StringIO(text)), 1):
+        row = [field.strip() for field in row]
+        if not any(row):
+            continue
+        if number == 1 and row[0].lower().replace("_", " ") in ("zip", "zip code"):
+            continue
+        if len(row) < 2:
+            raise ValueError(f"line {number}: expected zip code, service day and label")
+
+        zip_code, service_day = row[0], row[1].capitalize()
+        label = row[2] if len(row) > 2 and row[2] else zip_code
+        if not re.fullmatch(r"\d{5}", zip_code):
+            raise ValueError(f"line {number}: {zip_code} is not a zip code")
+        if service_day not in DAYS:
+            raise ValueError(f"line {number}: {row[1]} is not a day of the week")
+        if slugify(label) in keys:
+            raise ValueError(f"line {number}: {label} is listed more than once")
+
+        keys.add(slugify(label))
+        addresses.append(
+            {CONF_ZIP_CODE: zip_code, CONF_SERVICE_DAY: service_day, CONF_LABEL: label}
+        )
+
+    if not addresses:
+        raise ValueError("no addresses")
+    return addresses
+
+
+def fleet_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the one device all of a fleet's entities belong to."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer="Rumpke Waste & Recycling",
+        model="Waste & Recycling Service Fleet",
+        configuration_url="https://www.rumpke.com",
+    )
+
+
+class FleetAddress(PickupTimelineMixin):
+    """One address of a fleet, standing in for an entry coordinator for its entities."""
+
+    def __init__(
+        self, fleet: RumpkeFleetCoordinator, zip_code: str, service_day: str, label: str
+    ) -> None:
+        """Initialize the address."""
+        self.fleet = fleet
+        self.zip_code = zip_code
+        self.service_day = service_day
+        self.label = label
+        self.key = slugify(label)
+
+    @property
+    def data(self) -> dict[str, Any] | None:
+        """Return this address's part of the fleet's data."""
+        if not self.fleet.data:
+            return None
+        return self.fleet.data["addresses"].get(self.key)
+
+    @property
+    def event_id(self) -> str:
+        """Return what tells this address's calendar events apart from others'."""
+        return f"{self.zip_code}_{self.key}"
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True if the address has no data or the fleet's is stale."""
+        return self.data is None or self.fleet.is_stale
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for fleet updates."""
+        return self.fleet.async_add_listener(update_callback, context)
+
+    async def async_request_refresh(self) -> None:
+        """Refresh the whole fleet."""
+        await self.fleet.async_request_refresh()
+
+
+class RumpkeFleetCoordinator(EntryCoordinatorMixin, DataUpdateCoordinator):
+    """Coordinator for a fleet entry's addresses.
+
+    Each refresh looks up holidays once per distinct region, through the
+    shared region schedules, and alerts once per distinct county in the
+    shared alerts index, then fans them out to the addresses. Addresses in
+    the same region share one holidays list, so memory grows with the
+    number of regions rather than addresses.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        addresses: list[dict[str, str]],
+        schedules: RegionSchedules,
+        alerts: ServiceAlertsCoordinator | None = None,
+        snapshot: SnapshotStore | None = None,
+        max_staleness: timedelta = timedelta(hours=DEFAULT_MAX_STALENESS_HOURS),
+    ) -> None:
+        """Initialize the coordinator."""
+        self.schedules = schedules
+        self.alerts = alerts
+        self.snapshot = snapshot
+        self.max_staleness = max_staleness
+        self.addresses = {
+            address.key: address
+            for address in (
+                FleetAddress(
+                    self, config[CONF_ZIP_CODE], config[CONF_SERVICE_DAY], config[CONF_LABEL]
+                )
+                for config in addresses
+            )
+        }
+        self.zip_codes = sorted({address.zip_code for address in self.addresses.values()})
+
+        # Zip -> (county, state), or None if the zip isn't in the database
+        self._counties: dict[str, tuple[str, str] | None] = {}
+        # Zip -> holidays of its region, kept through failed refreshes
+        self._holidays: dict[str, list[dict[str, Any]]] = {}
+        # (state, county) -> past delay alerts, shared by addresses in the county
+        self._alert_history: dict[tuple[str, str], tuple[ServiceAlert, ...]] = {}
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Rumpke Waste & Recycling Fleet",
+            update_interval=holiday_scan_interval(max_staleness),
+        )
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch each region's holidays and the alerts, and fan them out."""
+
+        unresolved = [zip_code for zip_code in self.zip_codes if zip_code not in self._counties]
+        if unresolved:
+            # The first lookup reads the zip index from disk, keep it off the event loop
+            self._counties.update(
+                await async_run_blocking(self.hass, _lookup_counties, unresolved)
+            )
+
+        results, _ = await asyncio.gather(
+            asyncio.gather(
+                *(self._async_get_holidays(zip_code) for zip_code in self.zip_codes),
+                return_exceptions=True,
+            ),
+            self._async_wait_alerts(),
+        )
+
+        failed = []
+        for zip_code, holidays in zip(self.zip_codes, results):
+            if isinstance(holidays, Exception):
+                failed.append(zip_code)
+            else:
+                self._holidays[zip_code] = holidays
+        if len(failed) == len(self.zip_codes):
+            raise UpdateFailed("Failed to fetch holiday schedules")
+        if failed:
+            # Those addresses keep the holidays from their last refresh
+            _LOGGER.warning("Failed to fetch holiday schedules for %s", ", ".join(failed))
+
+        now = datetime.now()
+        data = {"addresses": self._build_addresses(now), "last_update": now}
+        self._async_data_stored(data)
+        return data
+
+    async def _async_get_holidays(self, zip_code: str) -> list[dict[str, Any]]:
+        """Return a zip's holidays, from its region's shared schedule if it can use it."""
+        holidays = await self.schedules.async_get_holidays(zip_code, verify=False)
+        if holidays is not None:
+            return holidays
+        # The region's schedule varies by zip, or the region is unknown
+        return await self.schedules.async_get_own_holidays(
+            zip_code, self._holidays.get(zip_code)
+        )
+
+    async def _async_wait_alerts(self) -> None:
+        """Wait for the shared alerts index's first fetch."""
+        if self.alerts is None:
+            return
+        try:
+            async with asyncio.timeout(ALERTS_FETCH_TIMEOUT):
+                await self.alerts.async_wait_ready()
+        except TimeoutError:
+            _LOGGER.warning("Service alerts not available")
+
+    def _restore_state(self, data: dict[str, Any]) -> None:
+        """Pick up each zip's holidays, county and alert history from a snapshot."""
+        for key, address_data in data["addresses"].items():
+            address = self.addresses.get(key)
+            if address is None:
+                continue
+            self._holidays[address.zip_code] = address_data["holidays"]
+            county, state = address_data.get("county"), address_data.get("state")
+            if county and state:
+                self._counties[address.zip_code] = (county, state)
+                self._alert_history[alert_key(county, state)] = address_data["alert_history"]
+
+    def _build_addresses(
+        self, last_update: datetime, previous: dict[str, dict[str, Any]] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Return each address's data.
+
+        Addresses whose data is the same as in previous keep that dict, so
+        their entities' caches stay valid.
+        """
+        alerts: dict[tuple[str, str], ServiceAlert | None] = {}
+        for county_state in {self._counties.get(zip_code) for zip_code in self.zip_codes}:
+            if county_state is None:
+                continue
+            county, state = county_state
+            key = alert_key(county, state)
+            alert = None
+            if self.alerts is not None and self.alerts.data is not None:
+                alert = self.alerts.data.get(key)
+            alerts[key] = alert
+            self._alert_history[key] = updated_alert_history(
+                self._alert_history.get(key, ()), alert
+            )
+
+        addresses = {}
+        for address in self.addresses.values():
+            holidays = self._holidays.get(address.zip_code)
+            if holidays is None:
+                continue
+            county, state = self._counties.get(address.zip_code) or (None, None)
+            key = alert_key(county, state) if county and state else None
+            data = {
+                "holidays": holidays,
+                "service_alert": alerts.get(key),
+                "alert_history": self._alert_history.get(key, ()),
+                "county": county,
+                "state": state,
+                "last_update": last_update,
+            }
+            old = previous.get(address.key) if previous else None
+            addresses[address.key] = old if old == data else data
+        return addresses
+
+    @callback
+    def async_handle_alerts_update(self) -> None:
+        """Pick up a new alerts index without waiting for our own refresh."""
+        if not self.data:
+            return
+
+        previous = self.data["addresses"]
+        addresses = self._build_addresses(self.data["last_update"], previous)
+        if any(addresses[key] is not previous.get(key) for key in addresses):
+            self.data = {**self.data, "addresses": addresses}
+            if self.snapshot is not None:
+                self.snapshot.async_save(self.data)
+            self.async_update_listeners()
+
+
+def _lookup_counties(zip_codes: list[str]) -> dict[str, tuple[str, str] | None]:
+    """Look up the county of each zip code."""
+    return {zip_code: get_county_from_zip(zip_code) for zip_code in zip_codes}
@@ -0,0 +1,233 @@
+"""iCalendar feeds of pickup dates, for syncing to external calendars."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import hashlib
+from http import HTTPStatus
+from itertools import takewhile
+import logging
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .calendar import pickup_event
+from .const import DOMAIN, ICS_PAST_DAYS
+from .coordinator import RumpkeDataCoordinator
+from .fleet import FleetAddress, RumpkeFleetCoordinator
+from .timeline import iter_pickups
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Rumpke Waste & Recycling//Pickup Schedule//EN\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+)
+CALENDAR_FOOTER = b"END:VCALENDAR\r\n"
+
+
+@dataclass
+class _Feed:
+    """One address's rendered events, and the data and date they were rendered from."""
+
+    data: dict[str, Any]
+    today: date
+    events: bytes
+    etag: str
+    # DTSTAMP of the events, when they were first rendered as they are now
+    stamp: datetime
+
+
+class RumpkeIcsView(HomeAssistantView):
+    """Serve pickups as iCalendar, for one entry or all of them.
+
+    Each address's events are rendered once per data update and date, and
+    served with a strong ETag so calendar clients that revalidate get a
+    304. A fleet's feed has all of its addresses. The feed for all entries
+    is written one address at a time rather than assembled in memory.
+    """
+
+    url = "/api/rumpke/ics"
+    extra_urls = ["/api/rumpke/ics/{entry_id}"]
+    name = "api:rumpke:ics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._feeds: dict[str, _Feed] = {}
+
+    async def get(
+        self, request: web.Request, entry_id: str | None = None
+    ) -> web.StreamResponse:
+        """Return the feed for an entry, or for all entries without one."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        loaded = _coordinators(hass)
+        # Forget the feeds of addresses that have been removed or unloaded
+        for feed_id in self._feeds.keys() - loaded.keys():
+            del self._feeds[feed_id]
+
+        coordinators = loaded if entry_id is None else _coordinators(hass, entry_id)
+        if entry_id is not None and not coordinators:
+            return self.json_message("Unknown entry", HTTPStatus.NOT_FOUND)
+
+        feeds = [
+            self._feed(feed_id, coordinator)
+            for feed_id, coordinator in coordinators.items()
+            if coordinator.data
+        ]
+        name = "Rumpke Pickups"
+        if entry_id is not None and (entry := hass.config_entries.async_get_entry(entry_id)):
+            name = entry.title
+        header = (CALENDAR_HEADER + f"X-WR-CALNAME:{_escape(name)}\r\n").encode()
+
+        # Built from the entries' ETags, so it's known before anything is written
+        etag = _etag(header + b"".join(feed.etag.encode() for feed in feeds))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = _if_none_match(request)
+        if etag in if_none_match or "*" in if_none_match:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        if len(feeds) == 1:
+            return web.Response(
+                body=header + feeds[0].events + CALENDAR_FOOTER,
+                headers=headers,
+                content_type="text/calendar",
+                charset="utf-8",
+            )
+
+        response = web.StreamResponse(headers={**headers, "Content-Type": CONTENT_TYPE})
+        await response.prepare(request)
+        await response.write(header)
+        for feed in feeds:
+            await response.write(feed.events)
+        await response.write(CALENDAR_FOOTER)
+        await response.write_eof()
+        return response
+
+    def _feed(
+        self, feed_id: str, coordinator: RumpkeDataCoordinator | FleetAddress
+    ) -> _Feed:
+        """
+        Return an address's rendered events, rendering them if its data or the date changed.
+
+        The events keep their DTSTAMP, and so their bytes and ETag, until
+        the pickups in them change, so a refresh that finds the same
+        pickups still gets clients a 304.
+        """
+        today = dt_util.now().date()
+        feed = self._feeds.get(feed_id)
+        if feed is not None and feed.data is coordinator.data and feed.today == today:
+            return feed
+
+        if feed is not None:
+            events = "".join(_vevents(coordinator, today, feed.stamp)).encode()
+            if events == feed.events:
+                feed.data, feed.today = coordinator.data, today
+                return feed
+
+        stamp = dt_util.utcnow().replace(microsecond=0)
+        events = "".join(_vevents(coordinator, today, stamp)).encode()
+        feed = self._feeds[feed_id] = _Feed(coordinator.data, today, events, _etag(events), stamp)
+        _LOGGER.debug("Rendered %d byte ICS feed for %s", len(events), coordinator.zip_code)
+        return feed
+
+
+def _coordinators(
+    hass: HomeAssistant, entry_id: str | None = None
+) -> dict[str, RumpkeDataCoordinator | FleetAddress]:
+    """
+    Return the loaded entries' addresses by feed id, for one entry or all.
+
+    A single address entry's feed id is its entry id, each address of a
+    fleet's is the fleet's entry id and the address's key.
+    """
+    coordinators: dict[str, RumpkeDataCoordinator | FleetAddress] = {}
+    for loaded_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        if entry_id is not None and loaded_id != entry_id:
+            continue
+        if isinstance(coordinator, RumpkeDataCoordinator):
+            coordinators[loaded_id] = coordinator
+        elif isinstance(coordinator, RumpkeFleetCoordinator):
+            for key, address in coordinator.addresses.items():
+                coordinators[f"{loaded_id}_{key}"] = address
+    return coordinators
+
+
+def _vevents(
+    coordinator: RumpkeDataCoordinator | FleetAddress, today: date, stamp: datetime
+) -> Iterator[str]:
+    """Yield the VEVENTs for an address's recent and upcoming pickups."""
+    timeline = coordinator.timeline
+    dtstamp = stamp.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    pickups = takewhile(
+        lambda pickup: pickup.date <= timeline.end,
+        iter_pickups(
+            coordinator.service_day,
+            coordinator.delay_index,
+            today - timedelta(days=ICS_PAST_DAYS),
+        ),
+    )
+    for pickup in pickups:
+        event = pickup_event(coordinator, pickup)
+        yield "".join(
+            _fold(line) + "\r\n"
+            for line in (
+                "BEGIN:VEVENT",
+                f"UID:{event.uid}@{DOMAIN}",
+                f"DTSTAMP:{dtstamp}",
+                f"DTSTART;VALUE=DATE:{event.start:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{event.end:%Y%m%d}",
+                f"SUMMARY:{_escape(event.summary)}",
+                f"DESCRIPTION:{_escape(event.description or '')}",
+                "TRANSP:TRANSPARENT",
+                "END:VEVENT",
+            )
+        )
+
+
+def _escape(text: str) -> str:
+    """Escape an iCalendar TEXT value."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets, as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+
+    parts = []
+    while encoded:
+        # Continuation lines start with a space, which counts towards their 75
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Don't split a multibyte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    return "\r\n ".join(parts)
+
+
+def _etag(body: bytes) -> str:
+    """Return a strong ETag for a body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _if_none_match(request: web.Request) -> set[str]:
+    """Return the ETags in a request's If-None-Match header."""
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip() for tag in header.split(",") if tag.strip()}
+
@@ -0,0 +1,170 @@
+"""Parse results shared across entries, keyed by page content hash."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .alerts_parser import ServiceAlert
+from .const import (
+    DATA_PARSE_CACHE,
+    DOMAIN,
+    PARSE_CACHE_DISK_SIZE,
+    PARSE_CACHE_SAVE_DELAY,
+    PARSE_CACHE_SIZE,
+    STORAGE_VERSION,
+)
+from .executor import async_run_blocking
+from .snapshot import decode_holidays, encode_holidays
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.parse_cache"
+
+
+def _encode_alerts(index: dict[tuple[str, str], ServiceAlert]) -> list[list[Any]]:
+    """Convert an alerts index to JSON-safe types."""
+    return [[state, county, alert.as_dict()] for (state, county), alert in index.items()]
+
+
+def _decode_alerts(stored: list[list[Any]]) -> dict[tuple[str, str], ServiceAlert]:
+    """Convert a stored alerts index back."""
+    return {(state, county): ServiceAlert.from_dict(alert) for state, county, alert in stored}
+
+
+# How each kind of parse result is written to the disk tier
+CODECS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "holidays": (encode_holidays, decode_holidays),
+    "alerts": (_encode_alerts, _decode_alerts),
+}
+
+
+class ParseCache:
+    """LRU of parse results keyed by (kind, content hash).
+
+    Identical pages are parsed once per process, however many entries or
+    refreshes fetch them. With persist, recently used results are also
+    kept in Home Assistant storage, so unchanged pages aren't parsed again
+    after a restart. Results are shared, so callers must not mutate them.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_entries: int = PARSE_CACHE_SIZE,
+        persist: bool = True,
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._parsing: dict[tuple[str, str], asyncio.Future] = {}
+        self._store: Store | None = (
+            Store(hass, STORAGE_VERSION, STORAGE_KEY) if persist else None
+        )
+        # Encoded results, "kind:hash" -> stored form, most recently used last
+        self._disk: dict[str, Any] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    async def async_load(self) -> None:
+        """Load the disk tier."""
+        async with self._load_lock:
+            if self._loaded or self._store is None:
+                return
+            stored = await self._store.async_load()
+            if stored:
+                self._disk = stored.get("entries", {})
+            self._loaded = True
+            _LOGGER.debug("Loaded %d stored parse results", len(self._disk))
+
+    def get(self, kind: str, content_hash: str) -> Any | None:
+        """Return a cached parse result, or None."""
+        key = (kind, content_hash)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._entries[key]
+
+        stored = self._disk.get(f"{kind}:{content_hash}")
+        if stored is None:
+            return None
+        try:
+            result = CODECS[kind][1](stored)
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning("Ignoring unreadable stored %s parse: %s", kind, e)
+            return None
+        self.stats["disk_hits"] += 1
+        self._put(key, result, persist=False)
+        return result
+
+    async def async_parse(
+        self, kind: str, content_hash: str, html: str, parse: Callable[[str], Any]
+    ) -> Any:
+        """
+        Return the parse of a page, parsing it in the executor on a miss.
+
+        Concurrent misses for the same page share one parse.
+        """
+        result = self.get(kind, content_hash)
+        if result is not None:
+            return result
+
+        key = (kind, content_hash)
+        if key in self._parsing:
+            self.stats["hits"] += 1
+            return await asyncio.shield(self._parsing[key])
+
+        self.stats["misses"] += 1
+        future = self._parsing[key] = self.hass.loop.create_future()
+        try:
+            result = await async_run_blocking(self.hass, parse, html)
+        except BaseException as e:
+            # Fail anyone sharing the parse too, even if only this caller was
+            # cancelled, so they don't wait for a result that never comes
+            if not isinstance(e, Exception):
+                e = HomeAssistantError(f"Parsing {kind} was cancelled")
+            future.set_exception(e)
+            # Mark it retrieved, there may be no one else waiting on it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._parsing[key]
+
+        self._put(key, result)
+        return result
+
+    def _put(self, key: tuple[str, str], result: Any, persist: bool = True) -> None:
+        """Add a result, evicting the least recently used past max_entries."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+        if persist and self._store is not None and key[0] in CODECS:
+            disk_key = f"{key[0]}:{key[1]}"
+            self._disk.pop(disk_key, None)
+            self._disk[disk_key] = CODECS[key[0]][0](result)
+            while len(self._disk) > PARSE_CACHE_DISK_SIZE:
+                del self._disk[next(iter(self._disk))]
+            self._store.async_delay_save(lambda: {"entries": self._disk}, PARSE_CACHE_SAVE_DELAY)
+
+
+async def async_get_parse_cache(hass: HomeAssistant) -> ParseCache:
+    """Return the shared parse cache, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_PARSE_CACHE)
+    if cache is None:
+        cache = domain_data[DATA_PARSE_CACHE] = ParseCache(hass)
+    await cache.async_load()
+    return cache
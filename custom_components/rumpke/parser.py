@@ -6,7 +6,10 @@ import re
 from datetime import datetime
 from typing import Any
 
-from bs4 import BeautifulSoup
+try:
+    from .parser_engines import Section, extract_sections
+except ImportError:
+    from parser_engines import Section, extract_sections
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,78 +18,73 @@ class HolidayScheduleParser:
     """Parser for Rumpke holiday schedule HTML."""
 
     @staticmethod
-    def parse(html: str) -> list[dict[str, Any]]:
+    def parse(html: str, engine: str | None = None) -> list[dict[str, Any]]:
         """Parse holiday schedule HTML and return structured data."""
-        soup = BeautifulSoup(html, "html.parser")
-        holidays = []
-
-        # Find all holiday accordion sections
-        accordion_sections = soup.find_all("div", class_="repeatable-content")
-
-        for section in accordion_sections:
-            try:
-                # Get the holiday name from the previous H3 tag
-                h3 = section.find_previous("h3", class_="tab")
-                if not h3:
-                    continue
-
-                holiday_name = h3.get_text(strip=True)
-
-                # Get the content div
-                content_div = section.find("div", class_="text")
-                if not content_div:
-                    continue
-
-                # Extract date from h3 inside content
-                date_h3 = content_div.find("h3")
-                date_str = date_h3.get_text(strip=True) if date_h3 else None
-
-                # Parse the date
-                holiday_date = None
-                if date_str:
-                    # Try multiple date formats
-                    formats = [
-                        "%A, %B %d, %Y",      # Monday, May 25, 2026
-                        "%A, %b. %d, %Y",     # Monday, Jan. 19, 2026
-                        "%A, %b %d, %Y",      # Monday, Jan 19, 2026
-                    ]
-                    # Handle "Sept." abbreviation (strptime doesn't recognize it)
-                    date_str_normalized = date_str.replace("Sept.", "Sep.")
-                    for fmt in formats:
-                        try:
-                            holiday_date = datetime.strptime(date_str_normalized, fmt).date()
-                            break
-                        except ValueError:
-                            continue
-
-                    if not holiday_date:
-                        _LOGGER.warning("Could not parse date: %s", date_str)
-
-                # Extract all paragraphs
-                paragraphs = content_div.find_all("p")
-                details = [p.get_text(strip=True) for p in paragraphs]
-
-                # Determine if there's a service delay
-                has_delay = HolidayScheduleParser._check_for_delay(details)
-                exceptions = HolidayScheduleParser._extract_exceptions(details)
-
-                holiday_data = {
-                    "name": holiday_name,
-                    "date": holiday_date,
-                    "date_str": date_str,
-                    "has_delay": has_delay,
-                    "details": details,
-                    "exceptions": exceptions,
-                }
-
-                holidays.append(holiday_data)
-                _LOGGER.debug("Parsed holiday: %s on %s (delay: %s)", holiday_name, holiday_date, has_delay)
-
-            except Exception as e:
-                _LOGGER.error("Error parsing holiday section: %s", e)
-                continue
-
-        return holidays
+        return [
+            holiday
+            for section in extract_sections(html, engine)
+            if (holiday := HolidayScheduleParser._parse_section(section)) is not None
+        ]
+
+    @staticmethod
+    def _parse_section(section: Section) -> dict[str, Any] | None:
+        """Parse one holiday section, or return None if it isn't one."""
+        try:
+            # Get the holiday name from the previous H3 tab
+            if section.tab is None:
+                return None
+
+            holiday_name = section.tab
+
+            # Get the content div
+            if section.text is None:
+                return None
+
+            # Date from the h3 inside the content
+            date_str = section.text.heading
+
+            # Parse the date
+            holiday_date = None
+            if date_str:
+                # Try multiple date formats
+                formats = [
+                    "%A, %B %d, %Y",      # Monday, May 25, 2026
+                    "%A, %b. %d, %Y",     # Monday, Jan. 19, 2026
+                    "%A, %b %d, %Y",      # Monday, Jan 19, 2026
+                ]
+                # Handle "Sept." abbreviation (strptime doesn't recognize it)
+                date_str_normalized = date_str.replace("Sept.", "Sep.")
+                for fmt in formats:
+                    try:
+                        holiday_date = datetime.strptime(date_str_normalized, fmt).date()
+                        break
+                    except ValueError:
+                        continue
+
+                if not holiday_date:
+                    _LOGGER.warning("Could not parse date: %s", date_str)
+
+            details = list(section.text.paragraphs)
+
+            # Determine if there's a service delay
+            has_delay = HolidayScheduleParser._check_for_delay(details)
+            exceptions = HolidayScheduleParser._extract_exceptions(details)
+
+            holiday_data = {
+                "name": holiday_name,
+                "date": holiday_date,
+                "date_str": date_str,
+                "has_delay": has_delay,
+                "details": details,
+                "exceptions": exceptions,
+            }
+
+            _LOGGER.debug("Parsed holiday: %s on %s (delay: %s)", holiday_name, holiday_date, has_delay)
+            return holiday_data
+
+        except Exception as e:
+            _LOGGER.error("Error parsing holiday section: %s", e)
+            return None
 
     @staticmethod
     def _check_for_delay(details: list[str]) -> bool:
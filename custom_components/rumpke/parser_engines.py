@@ -0,0 +1,207 @@
+"""HTML engines that extract the accordion sections both Rumpke pages are built from."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Accordion panel and its content block
+SECTION_CLASS = "repeatable-content"
+TEXT_CLASS = "text"
+TAB_CLASS = "tab"
+
+# Elements whose contents bs4's get_text() leaves out
+NON_TEXT_TAGS = ("script", "style", "template")
+
+
+@dataclass(frozen=True)
+class TextBlock:
+    """The div.text block inside a section."""
+
+    # Stripped text of its first h3, None if it has none
+    heading: str | None
+    # Stripped text of every p in it
+    paragraphs: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Section:
+    """One div.repeatable-content panel and the headings before it."""
+
+    # Unstripped text of the nearest h3 before the section
+    heading: str | None
+    # Stripped text of the nearest h3.tab before the section
+    tab: str | None
+    text: TextBlock | None
+    # Stripped text of every li in the section
+    items: tuple[str, ...]
+
+
+def _has_class(class_attr: str | None, name: str) -> bool:
+    """Return True if a class attribute includes name."""
+    return bool(class_attr) and name in class_attr.split()
+
+
+def _bs4_sections(html: str) -> list[Section]:
+    """Extract sections with BeautifulSoup's html.parser."""
+    soup = BeautifulSoup(html, "html.parser")
+    sections = []
+    for div in soup.find_all("div", class_=SECTION_CLASS):
+        heading = div.find_previous("h3")
+        tab = div.find_previous("h3", class_=TAB_CLASS)
+
+        text = None
+        text_div = div.find("div", class_=TEXT_CLASS)
+        if text_div:
+            text_h3 = text_div.find("h3")
+            text = TextBlock(
+                heading=text_h3.get_text(strip=True) if text_h3 else None,
+                paragraphs=tuple(p.get_text(strip=True) for p in text_div.find_all("p")),
+            )
+
+        sections.append(
+            Section(
+                heading=heading.get_text() if heading else None,
+                tab=tab.get_text(strip=True) if tab else None,
+                text=text,
+                items=tuple(li.get_text(strip=True) for li in div.find_all("li")),
+            )
+        )
+    return sections
+
+
+def _lxml_text(element, strip: bool = False) -> str:
+    """Return an element's text the way bs4's get_text() does."""
+    if strip:
+        return "".join(part.strip() for part in element.itertext())
+    return "".join(element.itertext())
+
+
+def _lxml_sections(html: str) -> list[Section]:
+    """Extract sections with lxml."""
+    if not html.strip():
+        return []
+    root = lxml.html.document_fromstring(html)
+    # Empty them rather than strip_elements(), which would merge the text around them
+    for element in list(root.iter(*NON_TEXT_TAGS)):
+        element.text = None
+        for child in list(element):
+            element.remove(child)
+
+    sections = []
+    heading = tab = None
+    # iter() walks in document order, so the last h3 seen is the one find_previous() finds
+    for element in root.iter("h3", "div"):
+        class_attr = element.get("class")
+        if element.tag == "h3":
+            heading = element
+            if _has_class(class_attr, TAB_CLASS):
+                tab = element
+            continue
+        if not _has_class(class_attr, SECTION_CLASS):
+            continue
+
+        text = None
+        for text_div in element.iterdescendants("div"):
+            if _has_class(text_div.get("class"), TEXT_CLASS):
+                text_h3 = next(text_div.iterdescendants("h3"), None)
+                text = TextBlock(
+                    heading=_lxml_text(text_h3, strip=True) if text_h3 is not None else None,
+                    paragraphs=tuple(
+                        _lxml_text(p, strip=True) for p in text_div.iterdescendants("p")
+                    ),
+                )
+                break
+
+        sections.append(
+            Section(
+                heading=_lxml_text(heading) if heading is not None else None,
+                tab=_lxml_text(tab, strip=True) if tab is not None else None,
+                text=text,
+                items=tuple(_lxml_text(li, strip=True) for li in element.iterdescendants("li")),
+            )
+        )
+    return sections
+
+
+def _selectolax_sections(html: str) -> list[Section]:
+    """Extract sections with selectolax's lexbor backend."""
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(NON_TEXT_TAGS))
+
+    sections = []
+    heading = tab = None
+    # Group selectors match in document order
+    for node in tree.css(f"h3, div.{SECTION_CLASS}"):
+        if node.tag == "h3":
+            heading = node
+            if _has_class(node.attributes.get("class"), TAB_CLASS):
+                tab = node
+            continue
+
+        text = None
+        # css() on a node can match the node itself
+        for text_div in node.css(f"div.{TEXT_CLASS}"):
+            if text_div.mem_id == node.mem_id:
+                continue
+            text_h3 = text_div.css_first("h3")
+            text = TextBlock(
+                heading=text_h3.text(separator="", strip=True) if text_h3 else None,
+                paragraphs=tuple(p.text(separator="", strip=True) for p in text_div.css("p")),
+            )
+            break
+
+        sections.append(
+            Section(
+                heading=heading.text() if heading else None,
+                tab=tab.text(separator="", strip=True) if tab else None,
+                text=text,
+                items=tuple(li.text(separator="", strip=True) for li in node.css("li")),
+            )
+        )
+    return sections
+
+
+# Fastest first; bs4 is always installed and is the fallback
+ENGINES: dict[str, Callable[[str], list[Section]]] = {}
+if LexborHTMLParser is not None:
+    ENGINES["selectolax"] = _selectolax_sections
+if lxml is not None:
+    ENGINES["lxml"] = _lxml_sections
+ENGINES["bs4"] = _bs4_sections
+
+DEFAULT_ENGINE = next(iter(ENGINES))
+
+
+def extract_sections(html: str, engine: str | None = None) -> list[Section]:
+    """
+    Extract the accordion sections from a Rumpke page.
+
+    Uses the fastest installed engine unless one is named. If it fails on
+    the page, falls back to bs4.
+    """
+    engine = engine or DEFAULT_ENGINE
+    # Normalize newlines the way HTML5 parsers do so every engine sees the same text
+    if "\r" in html:
+        html = html.replace("\r\n", "\n").replace("\r", "\n")
+    try:
+        return ENGINES[engine](html)
+    except Exception as e:
+        if engine == "bs4":
+            raise
+        _LOGGER.warning("%s failed to parse page, falling back to bs4: %s", engine, e)
+        return _bs4_sections(html)
@@ -0,0 +1,124 @@
+"""Persistent zip to region cache for Rumpke."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_REGION_CACHE,
+    DOMAIN,
+    REGION_CACHE_NEGATIVE_TTL,
+    REGION_CACHE_SAVE_DELAY,
+    REGION_CACHE_TTL,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.region_cache"
+
+
+class RegionCache:
+    """Zip code to region cache backed by Home Assistant storage.
+
+    Successful lookups are kept for REGION_CACHE_TTL. Zip codes outside the
+    service area are cached as negative entries for REGION_CACHE_NEGATIVE_TTL
+    so repeated setups for a bad zip don't keep hitting the region endpoint.
+    Which zips share their region's holiday schedule is kept for
+    REGION_CACHE_TTL too, so it isn't checked again after every restart.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._entries: dict[str, dict[str, Any]] = {}
+        # Region -> zips verified to share its holiday schedule, and whether it varies
+        self._regions: dict[str, dict[str, Any]] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load cached regions from storage."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load()
+            if stored:
+                self._entries = stored.get("zips", {})
+                self._regions = stored.get("regions", {})
+            self._loaded = True
+            _LOGGER.debug("Loaded %d cached regions", len(self._entries))
+
+    def get(self, zip_code: str) -> tuple[bool, dict[str, Any] | None]:
+        """
+        Look up a zip code.
+
+        Returns (hit, region_data). A negative hit is (True, None).
+        """
+        entry = self._entries.get(zip_code)
+        if entry is None:
+            return False, None
+
+        region_data = entry.get("data")
+        ttl = REGION_CACHE_TTL if region_data else REGION_CACHE_NEGATIVE_TTL
+        if time.time() - entry.get("fetched", 0) > ttl.total_seconds():
+            _LOGGER.debug("Cached region for %s expired", zip_code)
+            self.invalidate(zip_code)
+            return False, None
+
+        return True, region_data
+
+    def set(self, zip_code: str, region_data: dict[str, Any] | None) -> None:
+        """Store a lookup result, None for zips outside the service area."""
+        self._entries[zip_code] = {"data": region_data, "fetched": time.time()}
+        self._schedule_save()
+
+    def invalidate(self, zip_code: str) -> None:
+        """Drop a cached lookup."""
+        if self._entries.pop(zip_code, None) is not None:
+            _LOGGER.debug("Invalidated cached region for %s", zip_code)
+            self._schedule_save()
+
+    def get_schedule_sharing(self, region: str) -> tuple[list[str], bool] | None:
+        """
+        Look up which zips share a region's holiday schedule.
+
+        Returns (verified zips, varies), or None if unknown or expired.
+        """
+        entry = self._regions.get(region)
+        if entry is None:
+            return None
+        if time.time() - entry.get("fetched", 0) > REGION_CACHE_TTL.total_seconds():
+            _LOGGER.debug("Cached schedule sharing for %s expired", region)
+            del self._regions[region]
+            self._schedule_save()
+            return None
+        return entry["verified"], entry["varies"]
+
+    def set_schedule_sharing(self, region: str, verified: list[str], varies: bool) -> None:
+        """Store which zips share a region's holiday schedule."""
+        fetched = self._regions.get(region, {}).get("fetched", time.time())
+        self._regions[region] = {"verified": verified, "varies": varies, "fetched": fetched}
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        """Persist the cache after a short delay."""
+        self._store.async_delay_save(
+            lambda: {"zips": self._entries, "regions": self._regions},
+            REGION_CACHE_SAVE_DELAY,
+        )
+
+
+async def async_get_region_cache(hass: HomeAssistant) -> RegionCache:
+    """Return the shared region cache, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_REGION_CACHE)
+    if cache is None:
+        cache = domain_data[DATA_REGION_CACHE] = RegionCache(hass)
+    await cache.async_load()
+    return cache
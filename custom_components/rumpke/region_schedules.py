@@ -0,0 +1,210 @@
+"""Holiday schedules shared by every entry in the same Rumpke region."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import aiohttp
+
+from .api import RumpkeApiClient
+from .const import DATA_REGION_SCHEDULES, DOMAIN, REGION_SCHEDULE_TTL
+from .executor import async_run_blocking
+from .parse_cache import ParseCache
+from .parser import HolidayScheduleParser
+from .region_cache import RegionCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _RegionSchedule:
+    """The shared schedule for one region."""
+
+    # Zip the shared copy is fetched with, so revalidation hits the same URL
+    zip_code: str
+    holidays: list[dict[str, Any]] | None = None
+    fetched: float = 0.0
+    # Zips checked to get the same schedule as zip_code
+    verified: set[str] = field(default_factory=set)
+    # Set if a zip got a different schedule; entries then fetch their own
+    varies: bool = False
+    task: asyncio.Task | None = None
+
+
+class RegionSchedules:
+    """Fetch each region's holiday schedule once for all entries in it.
+
+    The schedule page is per region, so entries in the same region share
+    one download and one parse per REGION_SCHEDULE_TTL. Each zip's first
+    lookup also fetches its own copy to check it matches; if a region's
+    schedule turns out to vary by zip, its entries go back to fetching
+    their own. Both are kept in the region cache, so restarts don't
+    check every zip again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        region_cache: RegionCache | None = None,
+        parse_cache: ParseCache | None = None,
+    ) -> None:
+        """Initialize the shared schedules."""
+        self.hass = hass
+        self.api = RumpkeApiClient(session, region_cache)
+        self.region_cache = region_cache
+        self.parse_cache = parse_cache
+        self._regions: dict[str, _RegionSchedule] = {}
+        self.stats = {"fetches": 0, "shared": 0, "verified": 0, "varying_regions": 0}
+
+    async def async_get_holidays(
+        self, zip_code: str, verify: bool = True
+    ) -> list[dict[str, Any]] | None:
+        """
+        Return the holidays for a zip from its region's shared schedule.
+
+        Returns None if the zip should fetch its own schedule instead.
+        Raises UpdateFailed if the shared schedule can't be fetched.
+        Without verify, the zip's first lookup isn't checked against its
+        own copy, so a region costs one fetch however many zips are in it.
+        """
+        region_data = await self.api.get_region(zip_code)
+        if not region_data or "region" not in region_data:
+            return None
+
+        region = region_data["region"]
+        schedule = self._regions.get(region)
+        if schedule is None:
+            schedule = self._regions[region] = self._new_schedule(region, zip_code)
+        if schedule.varies:
+            return None
+
+        holidays = await self._async_shared(region, schedule)
+        if zip_code in schedule.verified or not verify:
+            return holidays
+
+        own = await self._async_fetch(zip_code, conditional=False)
+        self.stats["verified"] += 1
+        if own != holidays:
+            _LOGGER.info(
+                "Holiday schedule for %s differs from the rest of the %s region, "
+                "fetching it per zip from now on",
+                zip_code,
+                region,
+            )
+            schedule.varies = True
+            self.stats["varying_regions"] += 1
+            self._save_sharing(region, schedule)
+            return own
+
+        schedule.verified.add(zip_code)
+        self._save_sharing(region, schedule)
+        return holidays
+
+    async def async_get_own_holidays(
+        self, zip_code: str, previous: list[dict[str, Any]] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch a zip's own schedule, for zips that can't use their region's.
+
+        Revalidates against the last fetch when previous is given, and
+        returns previous if the page wasn't modified. Raises UpdateFailed
+        if the schedule can't be fetched.
+        """
+        holidays = await self._async_fetch(zip_code, conditional=previous is not None)
+        return previous if holidays is None else holidays
+
+    def _new_schedule(self, region: str, zip_code: str) -> _RegionSchedule:
+        """Start a region's schedule, from what the region cache knows about it."""
+        stored = self.region_cache.get_schedule_sharing(region) if self.region_cache else None
+        if stored is None or not stored[0]:
+            schedule = _RegionSchedule(zip_code, verified={zip_code})
+            self._save_sharing(region, schedule)
+            return schedule
+
+        verified, varies = stored
+        # Fetch the shared copy with a zip it was checked against
+        return _RegionSchedule(verified[0], verified=set(verified), varies=varies)
+
+    def _save_sharing(self, region: str, schedule: _RegionSchedule) -> None:
+        """Keep which zips share the region's schedule in the region cache."""
+        if self.region_cache is not None:
+            self.region_cache.set_schedule_sharing(
+                region,
+                [schedule.zip_code, *sorted(schedule.verified - {schedule.zip_code})],
+                schedule.varies,
+            )
+
+    async def _async_shared(
+        self, region: str, schedule: _RegionSchedule
+    ) -> list[dict[str, Any]]:
+        """Return the region's schedule, fetching it if it is older than the TTL."""
+        if (
+            schedule.holidays is not None
+            and time.monotonic() - schedule.fetched < REGION_SCHEDULE_TTL.total_seconds()
+        ):
+            self.stats["shared"] += 1
+            return schedule.holidays
+
+        if schedule.task is None:
+            schedule.task = self.hass.async_create_task(
+                self._async_refresh(schedule), f"{DOMAIN} {region} holiday schedule"
+            )
+        else:
+            self.stats["shared"] += 1
+        # Shield it so one entry timing out doesn't cancel it for the others
+        return await asyncio.shield(schedule.task)
+
+    async def _async_refresh(self, schedule: _RegionSchedule) -> list[dict[str, Any]]:
+        """Fetch the region's schedule."""
+        try:
+            holidays = await self._async_fetch(
+                schedule.zip_code, conditional=schedule.holidays is not None
+            )
+            if holidays is None:
+                # Not modified
+                holidays = schedule.holidays
+            schedule.holidays = holidays
+            schedule.fetched = time.monotonic()
+            return holidays
+        finally:
+            schedule.task = None
+
+    async def _async_fetch(
+        self, zip_code: str, conditional: bool
+    ) -> list[dict[str, Any]] | None:
+        """Fetch and parse one zip's schedule, None if it wasn't modified."""
+        self.stats["fetches"] += 1
+        result = await self.api.fetch_holiday_schedule(zip_code, conditional)
+        if result is None:
+            raise UpdateFailed(f"Failed to fetch holiday schedule for {zip_code}")
+        if result.html is None:
+            return None
+
+        if self.parse_cache is not None:
+            return await self.parse_cache.async_parse(
+                "holidays", result.content_hash, result.html, HolidayScheduleParser.parse
+            )
+        return await async_run_blocking(self.hass, HolidayScheduleParser.parse, result.html)
+
+
+@callback
+def async_get_region_schedules(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    region_cache: RegionCache | None = None,
+    parse_cache: ParseCache | None = None,
+) -> RegionSchedules:
+    """Return the shared region schedules, creating them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    schedules = domain_data.get(DATA_REGION_SCHEDULES)
+    if schedules is None:
+        schedules = domain_data[DATA_REGION_SCHEDULES] = RegionSchedules(
+            hass, session, region_cache, parse_cache
+        )
+    return schedules
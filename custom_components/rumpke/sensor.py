@@ -1,18 +1,22 @@
 """Sensor platform for Rumpke."""
 from __future__ import annotations
 
+from datetime import datetime
 import logging
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, CONF_ZIP_CODE
 from .coordinator import RumpkeDataCoordinator
-from .utils import calculate_next_pickup
+from .fleet import FleetAddress, RumpkeFleetCoordinator, fleet_device_info
+from .timeline import Pickup
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,19 +28,51 @@ async def async_setup_entry(
 ) -> None:
     """Set up Rumpke sensor."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([RumpkeNextPickupSensor(coordinator, entry)])
+    if isinstance(coordinator, RumpkeFleetCoordinator):
+        async_add_entities(
+            [
+                *(
+                    RumpkeNextPickupSensor(address, entry)
+                    for address in coordinator.addresses.values()
+                ),
+                RumpkeLastUpdateSensor(coordinator, entry),
+            ]
+        )
+        return
+
+    async_add_entities(
+        [RumpkeNextPickupSensor(coordinator, entry), RumpkeLastUpdateSensor(coordinator, entry)]
+    )
 
 
 class RumpkeNextPickupSensor(SensorEntity):
     """Sensor for next Rumpke pickup date."""
 
-    def __init__(self, coordinator: RumpkeDataCoordinator, entry: ConfigEntry) -> None:
+    def __init__(
+        self, coordinator: RumpkeDataCoordinator | FleetAddress, entry: ConfigEntry
+    ) -> None:
         """Initialize the sensor."""
         self.coordinator = coordinator
-        self._attr_name = "Next Pickup"
-        self._attr_unique_id = f"rumpke_{entry.data[CONF_ZIP_CODE]}_next_pickup"
+        # Skipped writes are counted on the coordinator that refreshes the data
+        self._data_coordinator = (
+            coordinator.fleet if isinstance(coordinator, FleetAddress) else coordinator
+        )
         self._attr_icon = "mdi:trash-can"
         self._attr_has_entity_name = True
+        # The coordinator pushes updates on its own schedule
+        self._attr_should_poll = False
+        # Availability, state and attributes last written
+        self._written: tuple[bool, Any, dict[str, Any]] | None = None
+
+        if isinstance(coordinator, FleetAddress):
+            # One of many addresses on the fleet's device
+            self._attr_name = f"{coordinator.label} Next Pickup"
+            self._attr_unique_id = f"rumpke_{entry.entry_id}_{coordinator.key}_next_pickup"
+            self._attr_device_info = fleet_device_info(entry)
+            return
+
+        self._attr_name = "Next Pickup"
+        self._attr_unique_id = f"rumpke_{entry.data[CONF_ZIP_CODE]}_next_pickup"
 
         # Create device info
         self._attr_device_info = DeviceInfo(
@@ -50,17 +86,18 @@ class RumpkeNextPickupSensor(SensorEntity):
     @property
     def state(self):
         """Return the next pickup date."""
-        next_date = self._calculate_next_pickup()
-        if next_date:
-            return next_date.strftime("%Y-%m-%d")
+        next_pickup = self._next_pickup()
+        if next_pickup:
+            return next_pickup.date.strftime("%Y-%m-%d")
         return None
 
     @property
     def extra_state_attributes(self):
         """Return additional attributes."""
-        next_date = self._calculate_next_pickup()
-        if not next_date:
+        next_pickup = self._next_pickup()
+        if not next_pickup:
             return {}
+        next_date = next_pickup.date
 
         # Use HA's timezone-aware now for days calculation
         now = dt_util.now()
@@ -71,14 +108,17 @@ class RumpkeNextPickupSensor(SensorEntity):
             "zip_code": self.coordinator.zip_code,
             "days_until_pickup": days_until,
             "pickup_date": next_date.strftime("%A, %B %d, %Y"),
-            "last_update": self.coordinator.data.get("last_update"),
         }
 
+        # Say why the pickup moved off its regular day
+        if next_pickup.reasons:
+            attrs["delay_reasons"] = list(next_pickup.reasons)
+
         # Add service alert info if present
         service_alert = self.coordinator.data.get("service_alert")
         if service_alert:
-            attrs["service_alert"] = service_alert.get("alert_type")
-            attrs["service_alert_text"] = service_alert.get("text")
+            attrs["service_alert"] = service_alert.alert_type
+            attrs["service_alert_text"] = service_alert.text
 
         # Add county info
         if self.coordinator.data.get("county"):
@@ -90,26 +130,91 @@ class RumpkeNextPickupSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
-
-    async def async_update(self):
-        """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+        # Last good data keeps being served through failed refreshes
+        return not self.coordinator.is_stale
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
+        # Home Assistant writes the initial state once this returns
+        self._written = (self.available, self.state, self.extra_state_attributes)
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._async_handle_coordinator_update)
         )
 
-    def _calculate_next_pickup(self) -> datetime.date | None:
-        """Calculate the next pickup date considering holidays."""
-        if not self.coordinator.data:
+    @callback
+    def _async_handle_coordinator_update(self) -> None:
+        """Write the state, unless nothing the recorder would store changed."""
+        written = (self.available, self.state, self.extra_state_attributes)
+        if written == self._written:
+            self._data_coordinator.state_writes_suppressed += 1
+            return
+        self._written = written
+        self.async_write_ha_state()
+
+    def _next_pickup(self) -> Pickup | None:
+        """Return the next pickup from the coordinator's timeline."""
+        timeline = self.coordinator.timeline
+        if timeline is None:
             _LOGGER.warning("No coordinator data available")
             return None
 
-        return calculate_next_pickup(
-            self.coordinator.service_day,
-            self.coordinator.data.get("holidays", []),
-            self.coordinator.data.get("service_alert"),
+        return timeline.next_pickup
+
+
+class RumpkeLastUpdateSensor(SensorEntity):
+    """Diagnostic sensor for when Rumpke's website was last read successfully."""
+
+    def __init__(
+        self, coordinator: RumpkeDataCoordinator | RumpkeFleetCoordinator, entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self._attr_name = "Last Update"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_has_entity_name = True
+        self._attr_should_poll = False
+        # Value last written
+        self._written: datetime | None = None
+
+        if isinstance(coordinator, RumpkeFleetCoordinator):
+            self._attr_unique_id = f"rumpke_{entry.entry_id}_last_update"
+            self._attr_device_info = fleet_device_info(entry)
+            return
+
+        self._attr_unique_id = f"rumpke_{entry.data[CONF_ZIP_CODE]}_last_update"
+
+        # Link to same device as the pickup sensor
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.data[CONF_ZIP_CODE])},
+            name=entry.title,
+            manufacturer="Rumpke Waste & Recycling",
+            model="Waste & Recycling Service",
+            configuration_url="https://www.rumpke.com",
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time of the last successful update."""
+        if not self.coordinator.data:
+            return None
+        # Stored as naive local time
+        return self.coordinator.data["last_update"].astimezone()
+
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        # Home Assistant writes the initial state once this returns
+        self._written = self.native_value
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._async_handle_coordinator_update)
         )
+
+    @callback
+    def _async_handle_coordinator_update(self) -> None:
+        """Write the state, unless the time of the last update didn't change."""
+        written = self.native_value
+        if written == self._written:
+            self.coordinator.state_writes_suppressed += 1
+            return
+        self._written = written
+        self.async_write_ha_state()
@@ -0,0 +1,93 @@
+"""Persisted snapshot of the last good coordinator data."""
+from __future__ import annotations
+
+from datetime import date, datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .alerts_parser import ServiceAlert
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Stores one entry's coordinator data so restarts can serve it immediately."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}")
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the last snapshot, or None if there isn't a usable one."""
+        try:
+            stored = await self._store.async_load()
+            return _decode(stored) if stored else None
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning("Ignoring unreadable snapshot: %s", e)
+            return None
+
+    def async_save(self, data: dict[str, Any]) -> None:
+        """Persist coordinator data after a short delay."""
+        self._store.async_delay_save(lambda: _encode(data), SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the snapshot."""
+        await self._store.async_remove()
+
+
+def _encode(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert coordinator data, or a fleet's, to JSON-safe types."""
+    if "addresses" in data:
+        return {
+            **data,
+            "addresses": {key: _encode(address) for key, address in data["addresses"].items()},
+            "last_update": data["last_update"].isoformat(),
+        }
+    return {
+        **data,
+        "holidays": encode_holidays(data.get("holidays", [])),
+        "service_alert": data["service_alert"].as_dict() if data.get("service_alert") else None,
+        "alert_history": [alert.as_dict() for alert in data.get("alert_history", ())],
+        "last_update": data["last_update"].isoformat(),
+    }
+
+
+def _decode(stored: dict[str, Any]) -> dict[str, Any]:
+    """Convert a stored snapshot back to coordinator data, or a fleet's."""
+    if "addresses" in stored:
+        return {
+            **stored,
+            "addresses": {key: _decode(address) for key, address in stored["addresses"].items()},
+            "last_update": datetime.fromisoformat(stored["last_update"]),
+        }
+    return {
+        **stored,
+        "holidays": decode_holidays(stored.get("holidays", [])),
+        "service_alert": (
+            ServiceAlert.from_dict(stored["service_alert"]) if stored.get("service_alert") else None
+        ),
+        "alert_history": tuple(
+            ServiceAlert.from_dict(alert) for alert in stored.get("alert_history", [])
+        ),
+        "last_update": datetime.fromisoformat(stored["last_update"]),
+    }
+
+
+def encode_holidays(holidays: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Convert parsed holidays to JSON-safe types."""
+    return [
+        {**holiday, "date": holiday["date"].isoformat() if holiday.get("date") else None}
+        for holiday in holidays
+    ]
+
+
+def decode_holidays(stored: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Convert stored holidays back."""
+    return [
+        {**holiday, "date": date.fromisoformat(holiday["date"]) if holiday.get("date") else None}
+        for holiday in stored
+    ]
@@ -0,0 +1,101 @@
+"""Precomputed pickup timeline shared by the sensor and calendar."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import takewhile
+from typing import TYPE_CHECKING
+
+from .const import TIMELINE_HORIZON_DAYS
+from .utils import DAYS, DelayIndex
+
+if TYPE_CHECKING:
+    from .alerts_parser import ServiceAlert
+
+
+@dataclass(frozen=True)
+class Pickup:
+    """One pickup, with the regular service date it was moved from."""
+
+    date: date
+    scheduled: date
+    reasons: tuple[str, ...] = ()
+
+    @property
+    def delayed(self) -> bool:
+        """Return True if the pickup isn't on its regular service date."""
+        return self.date != self.scheduled
+
+
+@dataclass(frozen=True)
+class PickupTimeline:
+    """Pickups from one day forward, built once per data update."""
+
+    today: date
+    end: date
+    pickups: tuple[Pickup, ...]
+
+    @property
+    def next_pickup(self) -> Pickup | None:
+        """Return the next pickup, today included."""
+        return self.pickups[0] if self.pickups else None
+
+    def covers(self, start: date, end: date) -> bool:
+        """Return True if every pickup between start and end is in the timeline."""
+        return self.today <= start and end <= self.end
+
+    def between(self, start: date, end: date) -> list[Pickup]:
+        """Return pickups from start to end inclusive."""
+        dates = [pickup.date for pickup in self.pickups]
+        return [
+            pickup
+            for pickup in self.pickups[bisect_left(dates, start):]
+            if pickup.date <= end
+        ]
+
+
+def build_timeline(
+    service_day: str,
+    holidays: list,
+    service_alert: ServiceAlert | None,
+    today: date,
+    horizon_days: int = TIMELINE_HORIZON_DAYS,
+    delay_index: DelayIndex | None = None,
+) -> PickupTimeline:
+    """
+    Build the pickup timeline from today through today + horizon_days.
+
+    Walks the regular service dates a week at a time starting with this
+    week's, so a pickup from earlier in the week that was delayed to today
+    or later is still included.
+    """
+    end = today + timedelta(days=horizon_days)
+    if delay_index is None:
+        delay_index = DelayIndex(holidays, service_alert)
+
+    pickups = takewhile(
+        lambda pickup: pickup.date <= end, iter_pickups(service_day, delay_index, today)
+    )
+    return PickupTimeline(today, end, tuple(pickups))
+
+
+def iter_pickups(service_day: str, delay_index: DelayIndex, start: date) -> Iterator[Pickup]:
+    """
+    Yield pickups from start on, in date order, for as long as asked.
+
+    Each pickup costs one week's delay lookup however far start is from
+    today, so any window, past or future, costs the same per pickup.
+    """
+    service_weekday = DAYS.get(service_day)
+    if service_weekday is None:
+        return
+
+    # Start with start's week, a pickup earlier that week may be delayed past it
+    scheduled = start + timedelta(days=service_weekday - start.weekday())
+    while True:
+        pickup_date, reasons = delay_index.resolve(scheduled)
+        if pickup_date >= start:
+            yield Pickup(pickup_date, scheduled, tuple(reasons))
+        scheduled += timedelta(weeks=1)
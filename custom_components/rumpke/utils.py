@@ -1,13 +1,24 @@
 """Utility functions for Rumpke integration."""
 from __future__ import annotations
 
+from collections.abc import Iterable
+import csv
 from datetime import datetime, timedelta
+import functools
 import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
 
 from homeassistant.util import dt as dt_util
 
+if TYPE_CHECKING:
+    from .alerts_parser import ServiceAlert
+
 _LOGGER = logging.getLogger(__name__)
 
+# Compact zip -> county/city/state table for OH, KY, IN, WV and IL
+ZIP_INDEX_PATH = Path(__file__).parent / "data" / "zip_index.csv"
+
 # Day name to weekday number mapping
 DAYS = {
     "Monday": 0,
@@ -20,155 +31,168 @@ DAYS = {
 }
 
 
-def get_county_from_zip(zip_code: str) -> tuple[str, str] | None:  # type: ignore[syntax]
-    """
-    Get county and state from zip code.
+class ZipInfo(NamedTuple):
+    """County, city and state for a zip code."""
 
-    Returns tuple of (county_name, state_abbr) or None if not found.
-    """
-    try:
-        import zipcodes
-
-        results = zipcodes.matching(zip_code)
-
-        if results and len(results) > 0:
-            result = results[0]
-            # Remove " County" suffix if present
-            county = result.get("county", "").replace(" County", "")
-            state = result.get("state")
+    county: str
+    city: str
+    state: str
 
-            if county and state:
-                _LOGGER.debug("Zip %s -> %s County, %s", zip_code, county, state)
-                return (county, state)
-
-        _LOGGER.warning("Zip code %s not found in database", zip_code)
-        return None
-    except ImportError:
-        _LOGGER.error("zipcodes library not installed")
-        return None
-    except Exception as e:
-        _LOGGER.error("Error looking up zip %s: %s", zip_code, e)
-        return None
 
+@functools.cache
+def _load_zip_index() -> dict[str, ZipInfo]:
+    """
+    Load the prebuilt zip index for the states Rumpke serves.
 
-def get_city_from_zip(zip_code: str) -> tuple[str, str] | None:  # type: ignore[syntax]
+    Built by scripts/build_zip_index.py. Loaded once, on first lookup.
     """
-    Get city and state from zip code.
+    with ZIP_INDEX_PATH.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)  # header
+        index = {
+            zip_code: ZipInfo(county, city, state)
+            for zip_code, state, county, city in reader
+        }
+    _LOGGER.debug("Loaded %d zip codes from %s", len(index), ZIP_INDEX_PATH.name)
+    return index
+
+
+def lookup_zip(zip_code: str) -> ZipInfo | None:
+    """
+    Get county, city and state for a zip code.
 
-    Returns tuple of (city_name, state_abbr) or None if not found.
+    Does file I/O on first use, so call it from an executor.
     """
     try:
-        import zipcodes
-
-        results = zipcodes.matching(zip_code)
-
-        if results and len(results) > 0:
-            result = results[0]
-            city = result.get("city")
-            state = result.get("state")
-
-            if city and state:
-                _LOGGER.debug("Zip %s -> %s, %s", zip_code, city, state)
-                return (city, state)
+        info = _load_zip_index().get(zip_code.strip())
+    except OSError as e:
+        _LOGGER.error("Error loading zip index: %s", e)
+        return None
 
+    if info is None:
         _LOGGER.warning("Zip code %s not found in database", zip_code)
-        return None
-    except ImportError:
-        _LOGGER.error("zipcodes library not installed")
-        return None
-    except Exception as e:
-        _LOGGER.error("Error looking up zip %s: %s", zip_code, e)
-        return None
+    return info
 
 
-def _is_pickup_in_alert_week(pickup_date: datetime.date, week_of: str) -> bool:
+def get_county_from_zip(zip_code: str) -> tuple[str, str] | None:  # type: ignore[syntax]
     """
-    Check if a pickup date falls within the service alert week.
+    Get county and state from zip code.
 
-    Args:
-        pickup_date: The pickup date to check
-        week_of: Week string from service alert (e.g., "jan. 26" or "Jan. 26")
+    Returns tuple of (county_name, state_abbr) or None if not found.
+    """
+    info = lookup_zip(zip_code)
+    if info and info.county and info.state:
+        _LOGGER.debug("Zip %s -> %s County, %s", zip_code, info.county, info.state)
+        return (info.county, info.state)
+    return None
 
-    Returns:
-        True if pickup is in the alert week, False otherwise
+
+def get_city_from_zip(zip_code: str) -> tuple[str, str] | None:  # type: ignore[syntax]
     """
-    try:
-        # Parse the week_of string (e.g., "jan. 26")
-        # Format: "Month Day" where month may have period
-        import re
-        from datetime import datetime as dt
-
-        # Clean up the string and parse
-        week_str = week_of.strip().replace(".", "").title()
-
-        # Try to parse with current year first
-        year = pickup_date.year
-        try:
-            # Try "Jan 26" format
-            week_start_date = dt.strptime(f"{week_str} {year}", "%b %d %Y").date()
-        except ValueError:
-            # Try full month name
-            week_start_date = dt.strptime(f"{week_str} {year}", "%B %d %Y").date()
-
-        # If parsed date is way in the past (earlier than 6 months ago), use next year
-        today = datetime.now().date()
-        if week_start_date < today - timedelta(days=180):
-            week_start_date = week_start_date.replace(year=year + 1)
-
-        # Calculate week boundaries (Monday-Sunday)
-        # The week_of date might be mid-week, so find the Monday of that week
-        days_to_monday = week_start_date.weekday()
-        week_start = week_start_date - timedelta(days=days_to_monday)
-        week_end = week_start + timedelta(days=6)
-
-        result = week_start <= pickup_date <= week_end
-        _LOGGER.debug(
-            "Alert week check: pickup=%s, week_of=%s, week=%s to %s, result=%s",
-            pickup_date,
-            week_of,
-            week_start,
-            week_end,
-            result,
-        )
-        return result
+    Get city and state from zip code.
 
-    except Exception as e:
-        _LOGGER.warning("Failed to parse week_of '%s': %s - skipping delay for this pickup", week_of, e)
-        # If we can't parse, don't apply the delay (safer to skip than incorrectly delay all weeks)
-        return False
+    Returns tuple of (city_name, state_abbr) or None if not found.
+    """
+    info = lookup_zip(zip_code)
+    if info and info.city and info.state:
+        _LOGGER.debug("Zip %s -> %s, %s", zip_code, info.city, info.state)
+        return (info.city, info.state)
+    return None
 
 
 def apply_holiday_delays(pickup_date: datetime.date, holidays: list) -> datetime.date:
     """Apply holiday delays to a pickup date."""
-    # Check for holidays in the week of the pickup
-    week_start = pickup_date - timedelta(days=pickup_date.weekday())
-    week_end = week_start + timedelta(days=6)
+    return DelayIndex(holidays).apply_holiday_delays(pickup_date, [])
 
-    for holiday in holidays:
-        if not holiday.get("has_delay") or not holiday.get("date"):
-            continue
 
-        holiday_date = holiday["date"]
+class DelayIndex:
+    """
+    Holiday and service alert delays, indexed for per-week lookups.
 
-        # If holiday is in the same week and before/on pickup day
-        if week_start <= holiday_date <= week_end and holiday_date <= pickup_date:
-            # Delay by one day
-            pickup_date += timedelta(days=1)
-            _LOGGER.debug(
-                "Pickup delayed by %s on %s, new date: %s",
-                holiday["name"],
-                holiday_date,
-                pickup_date,
+    Built once per data update so generating a long schedule costs one
+    dict lookup per week instead of a scan over every holiday.
+    """
+
+    def __init__(
+        self,
+        holidays: list,
+        service_alert: ServiceAlert | None = None,
+        alert_history: Iterable[ServiceAlert] = (),
+    ) -> None:
+        """Index the holidays, and past alerts, by week."""
+        # Week start (Monday) -> delaying holidays that week, in list order
+        self._holidays_by_week: dict[datetime.date, list[tuple[datetime.date, str]]] = {}
+        for holiday in holidays:
+            if not holiday.get("has_delay") or not holiday.get("date"):
+                continue
+            holiday_date = holiday["date"]
+            week_start = holiday_date - timedelta(days=holiday_date.weekday())
+            self._holidays_by_week.setdefault(week_start, []).append(
+                (holiday_date, holiday["name"])
             )
 
-    return pickup_date
+        self._service_alert = None
+        if service_alert and service_alert.has_delay and service_alert.delay_days > 0:
+            self._service_alert = service_alert
+
+        # Week start (Monday) -> alert that delayed pickups that week, for past weeks
+        self._alerts_by_week: dict[datetime.date, ServiceAlert] = {
+            alert.week_start: alert
+            for alert in alert_history
+            if alert.has_delay and alert.delay_days > 0 and alert.week_start is not None
+        }
+
+    def resolve(self, scheduled: datetime.date) -> tuple[datetime.date, list[str]]:
+        """
+        Apply service alert and holiday delays to a regularly scheduled pickup.
+
+        Returns tuple of (actual pickup date, reasons it moved).
+        """
+        pickup = scheduled
+        reasons: list[str] = []
+
+        # Apply service alert delays only if pickup is in the affected week
+        alert = self._service_alert
+        if not (alert and alert.applies_to(scheduled)):
+            alert = self._alerts_by_week.get(scheduled - timedelta(days=scheduled.weekday()))
+        if alert:
+            pickup += timedelta(days=alert.delay_days)
+            reasons.append(f"Service alert: {alert.alert_type}")
+
+        # Then apply holiday delays
+        pickup = self.apply_holiday_delays(pickup, reasons)
+
+        return pickup, reasons
+
+    def apply_holiday_delays(
+        self, pickup_date: datetime.date, reasons: list[str]
+    ) -> datetime.date:
+        """Apply holiday delays to a pickup date, appending each holiday to reasons."""
+        # Check for holidays in the week of the pickup
+        week_start = pickup_date - timedelta(days=pickup_date.weekday())
+
+        for holiday_date, name in self._holidays_by_week.get(week_start, ()):
+            # If holiday is before/on pickup day
+            if holiday_date <= pickup_date:
+                # Delay by one day
+                pickup_date += timedelta(days=1)
+                reasons.append(name)
+                _LOGGER.debug(
+                    "Pickup delayed by %s on %s, new date: %s",
+                    name,
+                    holiday_date,
+                    pickup_date,
+                )
+
+        return pickup_date
 
 
 def calculate_next_pickup(
     service_day: str,
     holidays: list,
-    service_alert: dict | None = None,
+    service_alert: ServiceAlert | None = None,
     from_date: datetime.date | None = None,
+    delay_index: DelayIndex | None = None,
 ) -> datetime.date | None:
     """
     Calculate next pickup date from a given date.
@@ -176,8 +200,9 @@ def calculate_next_pickup(
     Args:
         service_day: Day of week for service (e.g., "Thursday")
         holidays: List of holiday data dicts from coordinator
-        service_alert: Service alert dict from coordinator
+        service_alert: ServiceAlert from coordinator
         from_date: Calculate from this date (defaults to today)
+        delay_index: Prebuilt DelayIndex for holidays and service_alert
 
     Returns:
         Next pickup date or None if error
@@ -191,29 +216,16 @@ def calculate_next_pickup(
         _LOGGER.error("Invalid service day: %s", service_day)
         return None
 
+    if delay_index is None:
+        delay_index = DelayIndex(holidays, service_alert)
+
     # Check if a recent pickup (from this week) was delayed to today or a future date
     days_back = from_date.weekday() - service_weekday
     if days_back > 0:  # Service day was earlier this week
         recent_pickup = from_date - timedelta(days=days_back)
 
         # Calculate what this recent pickup would be with delays
-        delayed_pickup = recent_pickup
-
-        # Apply service alert delays
-        if service_alert and service_alert.get("has_delay"):
-            week_of = service_alert.get("week_of")
-            if week_of:
-                if _is_pickup_in_alert_week(recent_pickup, week_of):
-                    delay_days = service_alert.get("delay_days", 0)
-                    if delay_days > 0:
-                        delayed_pickup += timedelta(days=delay_days)
-            else:
-                delay_days = service_alert.get("delay_days", 0)
-                if delay_days > 0:
-                    delayed_pickup += timedelta(days=delay_days)
-
-        # Apply holiday delays
-        delayed_pickup = apply_holiday_delays(delayed_pickup, holidays)
+        delayed_pickup, _ = delay_index.resolve(recent_pickup)
 
         # If the delayed pickup is today or in the future, return it
         if delayed_pickup >= from_date:
@@ -229,44 +241,14 @@ def calculate_next_pickup(
     if days_ahead < 0:  # Target day already happened this week
         days_ahead += 7
 
-    next_pickup = from_date + timedelta(days=days_ahead)
-
-    # Apply service alert delays only if pickup is in the affected week
-    if service_alert and service_alert.get("has_delay"):
-        week_of = service_alert.get("week_of")
-        if week_of:
-            # Parse week_of date (e.g., "jan. 26" or "Jan. 26")
-            if _is_pickup_in_alert_week(next_pickup, week_of):
-                delay_days = service_alert.get("delay_days", 0)
-                if delay_days > 0:
-                    next_pickup += timedelta(days=delay_days)
-                    _LOGGER.debug(
-                        "Applied service alert delay of %d day(s) to %s (week of %s)",
-                        delay_days,
-                        next_pickup,
-                        week_of,
-                    )
-        else:
-            # No week specified - apply to all pickups (rare case)
-            delay_days = service_alert.get("delay_days", 0)
-            if delay_days > 0:
-                next_pickup += timedelta(days=delay_days)
-                _LOGGER.debug(
-                    "Applied service alert delay of %d day(s) to %s (no week specified)",
-                    delay_days,
-                    next_pickup,
-                )
-
-    # Then apply holiday delays
-    next_pickup = apply_holiday_delays(next_pickup, holidays)
-
+    next_pickup, _ = delay_index.resolve(from_date + timedelta(days=days_ahead))
     return next_pickup
 
 
 def generate_pickup_dates(
     service_day: str,
     holidays: list,
-    service_alert: dict | None,
+    service_alert: ServiceAlert | None,
     start_date: datetime.date,
     end_date: datetime.date,
 ) -> list[datetime.date]:
@@ -276,7 +258,7 @@ def generate_pickup_dates(
     Args:
         service_day: Day of week for service
         holidays: List of holiday data dicts
-        service_alert: Service alert dict
+        service_alert: ServiceAlert
         start_date: Start of date range
         end_date: End of date range
 
@@ -285,11 +267,12 @@ def generate_pickup_dates(
     """
     pickup_dates = []
     current_date = start_date
+    delay_index = DelayIndex(holidays, service_alert)
 
     # Generate pickups until we exceed the end date
     while current_date <= end_date:
         next_pickup = calculate_next_pickup(
-            service_day, holidays, service_alert, current_date
+            service_day, holidays, service_alert, current_date, delay_index
         )
 
         if next_pickup is None:
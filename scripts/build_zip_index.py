@@ -0,0 +1,40 @@
+"""Build the compact zip code index shipped with the integration.
+
+Run from the repository root after upgrading the zipcodes package:
+
+    python scripts/build_zip_index.py
+"""
+import csv
+from pathlib import Path
+
+import zipcodes
+
+# States Rumpke serves
+STATES = ("OH", "KY", "IN", "WV", "IL")
+
+OUTPUT = Path(__file__).parent.parent / "custom_components" / "rumpke" / "data" / "zip_index.csv"
+
+
+def main():
+    """Write zip,state,county,city rows sorted by zip code."""
+    rows = sorted(
+        (
+            entry["zip_code"],
+            entry["state"],
+            (entry.get("county") or "").replace(" County", ""),
+            entry.get("city") or "",
+        )
+        for entry in zipcodes.list_all()
+        if entry["state"] in STATES
+    )
+
+    with OUTPUT.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(("zip", "state", "county", "city"))
+        writer.writerows(rows)
+
+    print(f"Wrote {len(rows)} zip codes to {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
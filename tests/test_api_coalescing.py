@@ -0,0 +1,81 @@
+"""Test that concurrent identical requests share one HTTP request."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke.api import RumpkeApiClient
+
+
+class FakeResponse:
+    """Minimal aiohttp response."""
+
+    def __init__(self, url):
+        self.status = 200
+        self.headers = {"ETag": '"1"'}
+        self.url = url
+
+    async def __aenter__(self):
+        # Stay in flight long enough for the other callers to arrive
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def json(self):
+        return {"region": "Cincinnati"}
+
+    async def text(self):
+        return "<html></html>"
+
+
+class FakeSession:
+    """Minimal aiohttp session that records requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append((url, params, headers))
+        return FakeResponse(url)
+
+
+def test_concurrent_requests_are_coalesced():
+    """Clients sharing a session share identical in-flight requests."""
+    session = FakeSession()
+    clients = [RumpkeApiClient(session) for _ in range(5)]
+
+    async def run():
+        return await asyncio.gather(
+            *(client.get_region("45202") for client in clients),
+            *(client.get_service_alerts_html() for client in clients),
+        )
+
+    results = asyncio.run(run())
+    assert results[:5] == [{"region": "Cincinnati"}] * 5
+    assert results[5:] == ["<html></html>"] * 5
+    assert len(session.requests) == 2
+    assert clients[0].coalescer.stats == {"requests": 2, "coalesced": 8}
+
+
+def test_sequential_requests_are_not_coalesced():
+    """Only requests in flight at the same time are shared."""
+    session = FakeSession()
+    client = RumpkeApiClient(session)
+
+    async def run():
+        await client.get_service_alerts_html()
+        await client.get_service_alerts_html()
+
+    asyncio.run(run())
+    assert len(session.requests) == 2
+    assert client.coalescer.stats["coalesced"] == 0
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_are_coalesced()
+    test_sequential_requests_are_not_coalesced()
+    print("✓ request coalescing tests passed")
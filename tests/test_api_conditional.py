@@ -0,0 +1,129 @@
+"""Test conditional requests and reusing the parse of an unchanged page."""
+import asyncio
+import hashlib
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rumpke.api import RateLimiter, RumpkeApiClient, set_rate_limiter
+from custom_components.rumpke.coordinator import ServiceAlertsCoordinator
+
+ALERTS_HTML = (Path(__file__).parent / "fixtures" / "service_alerts.html").read_text()
+
+
+class FakeResponse:
+    """Minimal aiohttp response."""
+
+    def __init__(self, status, body=None, etag=None):
+        self.status = status
+        self.body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def text(self):
+        return self.body
+
+
+class FakeSession:
+    """Serves one page, answering 304 when revalidated with its current ETag."""
+
+    def __init__(self, page):
+        self.page = page
+        # Whether the server sends ETags and honours If-None-Match
+        self.etags = True
+        self.requests = []
+        # Don't wait on the default rate limit
+        set_rate_limiter(self, RateLimiter(rate=1000, burst=100))
+
+    @property
+    def etag(self):
+        return f'"{hashlib.md5(self.page.encode()).hexdigest()}"'
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append(headers or {})
+        if not self.etags:
+            return FakeResponse(200, self.page)
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.page, self.etag)
+
+
+def test_revalidates_with_etag():
+    """A conditional fetch sends the stored ETag and gets no body back on a 304."""
+    session = FakeSession(ALERTS_HTML)
+    client = RumpkeApiClient(session)
+
+    async def run():
+        return (
+            await client.fetch_service_alerts(conditional=False),
+            await client.fetch_service_alerts(),
+            await client.fetch_service_alerts(conditional=False),
+        )
+
+    first, revalidated, unconditional = asyncio.run(run())
+    assert first.html == ALERTS_HTML and first.changed
+    assert session.requests[1] == {"If-None-Match": session.etag}
+    assert revalidated.html is None
+    assert not revalidated.changed
+    assert revalidated.content_hash == first.content_hash
+    assert client.stats["not_modified"] == 1
+    assert client.stats["bytes_saved"] == len(ALERTS_HTML)
+
+    # Without conditional, no validators are sent and the same body isn't "changed"
+    assert session.requests[2] == {}
+    assert unconditional.html == ALERTS_HTML and not unconditional.changed
+
+
+def test_unchanged_page_is_not_parsed_again():
+    """A 304, or a page with the same content hash, reuses the previous parse."""
+    session = FakeSession(ALERTS_HTML)
+    etag = session.etag
+
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        alerts = ServiceAlertsCoordinator(hass, session)
+        indexes = []
+
+        await alerts.async_refresh()
+        indexes.append(alerts.data)
+        # Not modified
+        await alerts.async_refresh()
+        indexes.append(alerts.data)
+        # Downloaded again by a server without ETags, but the same page
+        session.etags = False
+        await alerts.async_refresh()
+        indexes.append(alerts.data)
+        skipped = alerts.parses_skipped
+        # A new page is parsed
+        session.page = ALERTS_HTML.replace("</body>", "<!-- updated --></body>")
+        await alerts.async_refresh()
+        indexes.append(alerts.data)
+
+        await alerts.async_shutdown()
+        await hass.async_stop(force=True)
+        return indexes, skipped, alerts.parses_skipped
+
+    indexes, skipped, parses_skipped = asyncio.run(run())
+    assert indexes[0]
+    assert indexes[1] is indexes[0]
+    assert indexes[2] is indexes[0]
+    assert skipped == parses_skipped == 2
+    assert indexes[3] is not indexes[0]
+    assert indexes[3] == indexes[0]
+    assert session.requests[1] == {"If-None-Match": etag}
+
+
+if __name__ == "__main__":
+    test_revalidates_with_etag()
+    test_unchanged_page_is_not_parsed_again()
+    print("✓ conditional request tests passed")
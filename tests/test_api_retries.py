@@ -0,0 +1,164 @@
+"""Test request retries and the per-host circuit breaker."""
+import asyncio
+import sys
+from pathlib import Path
+
+import aiohttp
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke import api
+from custom_components.rumpke.api import (
+    CircuitBreaker,
+    RateLimiter,
+    RumpkeApiClient,
+    get_breaker,
+    get_breakers,
+    set_rate_limiter,
+)
+
+# Don't wait between retries
+api.RETRY_BACKOFF = 0.0
+
+
+class FakeResponse:
+    """Minimal aiohttp response."""
+
+    # Raised while reading a 200 answer's body, if set
+    text_error = None
+
+    def __init__(self, status):
+        self.status = status
+        self.headers = {}
+
+    async def __aenter__(self):
+        if isinstance(self.status, Exception):
+            raise self.status
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def text(self):
+        if self.status == 200 and FakeResponse.text_error is not None:
+            raise FakeResponse.text_error
+        return "<html></html>"
+
+
+class FakeSession:
+    """Minimal aiohttp session answering with scripted statuses or errors."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = 0
+        # Don't wait on the default rate limit either
+        set_rate_limiter(self, RateLimiter(rate=1000, burst=100))
+
+    def get(self, url, params=None, headers=None):
+        self.requests += 1
+        return FakeResponse(self.answers.pop(0) if self.answers else 200)
+
+
+def test_transient_errors_are_retried():
+    """Timeouts, connection errors and 5xx answers are retried."""
+    session = FakeSession(aiohttp.ClientConnectionError(), 503)
+    client = RumpkeApiClient(session)
+
+    html = asyncio.run(client.get_service_alerts_html())
+    assert html == "<html></html>"
+    assert session.requests == 3
+    assert client.stats["retries"] == 2
+    assert client.stats["failed_requests"] == 0
+
+
+def test_client_errors_are_not_retried():
+    """A 404 is an answer, not a failure."""
+    session = FakeSession(404)
+    client = RumpkeApiClient(session)
+
+    assert asyncio.run(client.get_service_alerts_html()) is None
+    assert session.requests == 1
+    assert client.stats["retries"] == 0
+    assert get_breakers(session)["www.rumpke.com"].failures == 0
+
+
+def test_breaker_opens_and_short_circuits():
+    """Once open, requests fail fast without reaching the host."""
+    session = FakeSession(*[500] * (api.RETRY_ATTEMPTS * api.BREAKER_FAILURE_THRESHOLD))
+    client = RumpkeApiClient(session)
+
+    async def run():
+        for _ in range(api.BREAKER_FAILURE_THRESHOLD + 2):
+            assert await client.get_service_alerts_html() is None
+
+    asyncio.run(run())
+    breaker = get_breakers(session)["www.rumpke.com"]
+    assert breaker.state == "open"
+    assert session.requests == api.RETRY_ATTEMPTS * api.BREAKER_FAILURE_THRESHOLD
+    assert client.stats["short_circuited"] == 2
+
+
+def test_breaker_probes_after_cooldown():
+    """After the cooldown one request probes the host."""
+    breaker = CircuitBreaker("example.com", failure_threshold=1, cooldown=0, max_cooldown=10)
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # Cooldown over: one probe, the rest wait for it
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_without_outcome_frees_breaker():
+    """A probe that is cancelled or can't read its answer doesn't wedge the breaker."""
+    session = FakeSession()
+    client = RumpkeApiClient(session)
+    breaker = get_breaker(session, "www.rumpke.com")
+    breaker.failure_threshold = 1
+    breaker.cooldown = breaker.base_cooldown = breaker.max_cooldown = 0
+    breaker.record_failure()
+
+    async def cancelled_probe():
+        FakeResponse.text_error = asyncio.CancelledError()
+        try:
+            await client._send_with_retries(api.SERVICE_ALERTS_URL, None, None, False)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            FakeResponse.text_error = None
+
+    asyncio.run(cancelled_probe())
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    breaker.release()
+
+    FakeResponse.text_error = UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+    try:
+        assert asyncio.run(client.get_service_alerts_html()) is None
+    finally:
+        FakeResponse.text_error = None
+    assert breaker.state == "open"
+
+    # The next probe gets through and closes it
+    assert asyncio.run(client.get_service_alerts_html()) == "<html></html>"
+    assert breaker.state == "closed"
+    assert client.stats["short_circuited"] == 0
+
+
+if __name__ == "__main__":
+    test_transient_errors_are_retried()
+    test_client_errors_are_not_retried()
+    test_breaker_opens_and_short_circuits()
+    test_breaker_probes_after_cooldown()
+    test_probe_without_outcome_frees_breaker()
+    print("✓ retry and circuit breaker tests passed")
@@ -0,0 +1,267 @@
+"""Test the coordinators' refresh scheduling, snapshot restore and staleness."""
+import asyncio
+import sys
+import tempfile
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.rumpke import coordinator as coordinator_module
+from custom_components.rumpke.alerts_parser import ServiceAlert
+from custom_components.rumpke.coordinator import (
+    RumpkeDataCoordinator,
+    ServiceAlertsCoordinator,
+    holiday_retry_interval,
+    holiday_scan_interval,
+)
+from custom_components.rumpke.snapshot import SnapshotStore
+from tests.test_region_schedules import FakeSession
+
+HOLIDAYS = [
+    {
+        "name": "Labor Day",
+        "date": date(2026, 9, 7),
+        "date_str": "Monday, September 7, 2026",
+        "has_delay": True,
+        "details": [],
+        "exceptions": [],
+    }
+]
+
+
+class FakeSchedules:
+    """Serves the same holidays to every refresh, counting them."""
+
+    def __init__(self):
+        self.fetches = 0
+
+    async def async_get_holidays(self, zip_code):
+        self.fetches += 1
+        return HOLIDAYS
+
+
+def _coordinator(hass, snapshot=None, max_staleness=timedelta(hours=72)):
+    """Return a coordinator for 45202 refreshed from fake schedules."""
+    return RumpkeDataCoordinator(
+        hass,
+        FakeSession(),
+        "45202",
+        "Thursday",
+        snapshot=snapshot,
+        max_staleness=max_staleness,
+        schedules=FakeSchedules(),
+    )
+
+
+def test_restores_snapshot():
+    """A restart serves the last saved data without fetching it again."""
+    config_dir = tempfile.mkdtemp()
+
+    async def first_run():
+        hass = HomeAssistant(config_dir)
+        coordinator = _coordinator(hass, SnapshotStore(hass, "entry"))
+        await coordinator.async_refresh()
+        await coordinator.async_shutdown()
+        # Writes the delayed snapshot save
+        await hass.async_stop(force=True)
+        return coordinator.data
+
+    async def restart(max_staleness):
+        hass = HomeAssistant(config_dir)
+        coordinator = _coordinator(hass, SnapshotStore(hass, "entry"), max_staleness)
+        restored = await coordinator.async_restore_snapshot()
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return restored, coordinator
+
+    data = asyncio.run(first_run())
+    restored, coordinator = asyncio.run(restart(timedelta(hours=72)))
+    assert restored
+    assert coordinator.data == data
+    assert (coordinator.county, coordinator.state) == ("Hamilton", "OH")
+    assert not coordinator.is_stale
+    assert coordinator.schedules.fetches == 0
+
+    # Too old to serve
+    restored, coordinator = asyncio.run(restart(timedelta(0)))
+    assert not restored
+    assert coordinator.data is None
+    assert coordinator.is_stale
+
+
+def test_goes_stale_until_refreshed():
+    """Data goes stale max_staleness after the last refresh, until the next one."""
+
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        coordinator = _coordinator(hass, max_staleness=timedelta(seconds=0.2))
+        assert coordinator.is_stale
+
+        await coordinator.async_refresh()
+        fresh = not coordinator.is_stale and coordinator._unsub_stale is not None
+        await asyncio.sleep(0.3)
+        stale = coordinator.is_stale
+        # The stale timer fired to tell the entities
+        timer_fired = coordinator._unsub_stale is None
+
+        await coordinator.async_refresh()
+        refreshed = not coordinator.is_stale
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return fresh, stale, timer_fired, refreshed
+
+    assert asyncio.run(run()) == (True, True, True, True)
+
+
+def _today(monkeypatch, today):
+    """Make today's date in Home Assistant's time zone the given one."""
+    monkeypatch.setattr(dt_util, "now", lambda: datetime.combine(today, datetime.min.time()))
+
+
+@pytest.mark.parametrize(
+    ("today", "max_staleness", "expected"),
+    [
+        # Most of the year, weekly unless that would let the data go stale
+        (date(2026, 6, 17), timedelta(hours=72), timedelta(hours=36)),
+        (date(2026, 6, 17), timedelta(days=30), timedelta(days=7)),
+        # Daily from three weeks before New Year through its first week
+        (date(2026, 12, 10), timedelta(days=30), timedelta(days=7)),
+        (date(2026, 12, 11), timedelta(days=30), timedelta(days=1)),
+        (date(2027, 1, 7), timedelta(days=30), timedelta(days=1)),
+        (date(2027, 1, 8), timedelta(days=30), timedelta(days=7)),
+        (date(2026, 12, 20), timedelta(hours=24), timedelta(hours=12)),
+    ],
+)
+def test_holiday_scan_interval(monkeypatch, today, max_staleness, expected):
+    """The holiday schedule is polled rarely, except around New Year."""
+    _today(monkeypatch, today)
+    assert holiday_scan_interval(max_staleness) == expected
+
+
+@pytest.mark.parametrize(
+    ("failures", "jitter", "scan_interval", "expected"),
+    [
+        (1, 1.0, timedelta(days=7), timedelta(minutes=15)),
+        (2, 1.0, timedelta(days=7), timedelta(minutes=30)),
+        (3, 1.0, timedelta(days=7), timedelta(hours=1)),
+        (5, 1.0, timedelta(days=7), timedelta(hours=4)),
+        (6, 1.0, timedelta(days=7), timedelta(hours=4)),
+        (20, 1.0, timedelta(days=7), timedelta(hours=4)),
+        # Jitter takes off up to half
+        (1, 0.5, timedelta(days=7), timedelta(minutes=7.5)),
+        (6, 0.5, timedelta(days=7), timedelta(hours=2)),
+        # Never later than the regular refresh
+        (5, 1.0, timedelta(hours=1), timedelta(hours=1)),
+    ],
+)
+def test_holiday_retry_interval(monkeypatch, failures, jitter, scan_interval, expected):
+    """Retries start at 15 minutes and double per failure up to 4 hours."""
+    monkeypatch.setattr(coordinator_module.random, "uniform", lambda low, high: jitter)
+    assert holiday_retry_interval(failures, scan_interval) == expected
+
+
+def _alert(has_delay=True, week_end=date(2026, 6, 21)):
+    """Return a service alert for the week ending week_end."""
+    return ServiceAlert(
+        text="Trash and recycling services are operating on a one-day delay",
+        has_delay=has_delay,
+        delay_days=1 if has_delay else 0,
+        alert_type="one_day_delay" if has_delay else "unknown",
+        week_of=None,
+        week_start=week_end - timedelta(days=6) if week_end else None,
+        week_end=week_end,
+    )
+
+
+@pytest.mark.parametrize(
+    ("today", "alerts", "service_days", "expected"),
+    [
+        # Hourly while a delay is in effect
+        (date(2026, 6, 17), [_alert()], {}, timedelta(hours=1)),
+        (date(2026, 6, 17), [_alert(week_end=None)], {}, timedelta(hours=1)),
+        # Alerts that delay nothing now don't count
+        (date(2026, 6, 17), [_alert(week_end=date(2026, 6, 14))], {}, timedelta(hours=24)),
+        (date(2026, 6, 17), [_alert(has_delay=False)], {}, timedelta(hours=24)),
+        (date(2026, 6, 17), None, {}, timedelta(hours=24)),
+        # Every 3 hours in winter
+        (date(2026, 12, 1), None, {}, timedelta(hours=3)),
+        (date(2027, 3, 31), None, {}, timedelta(hours=3)),
+        (date(2027, 4, 1), None, {}, timedelta(hours=24)),
+        # And the day before and of a service day (3 is Thursday)
+        (date(2026, 6, 17), None, {3: 1}, timedelta(hours=3)),
+        (date(2026, 6, 18), None, {3: 1}, timedelta(hours=3)),
+        (date(2026, 6, 19), None, {3: 1}, timedelta(hours=24)),
+        # Unless no entry is picked up that day anymore
+        (date(2026, 6, 18), None, {3: 0}, timedelta(hours=24)),
+    ],
+)
+def test_alerts_scan_interval(monkeypatch, today, alerts, service_days, expected):
+    """Service alerts are polled hourly, every 3 hours or daily."""
+    _today(monkeypatch, today)
+    index = None if alerts is None else {("OH", str(n)): alert for n, alert in enumerate(alerts)}
+    alerts_coordinator = SimpleNamespace(_service_days=Counter(service_days))
+    assert ServiceAlertsCoordinator._scan_interval(alerts_coordinator, index) == expected
+
+
+def test_refresh_slot_is_fixed_per_entry(monkeypatch):
+    """Each entry refreshes at its own point in the interval, half to one and a half intervals on."""
+    interval = timedelta(days=7)
+    jitter = coordinator_module.REFRESH_JITTER
+
+    async def create():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        coordinators = [_coordinator(hass) for _ in range(3)]
+        await hass.async_stop(force=True)
+        return coordinators
+
+    coordinators = asyncio.run(create())
+    for coordinator, entry_id in zip(coordinators, ("abc", "abc", "def")):
+        coordinator.config_entry = SimpleNamespace(entry_id=entry_id)
+
+    def delay(coordinator, now, offset=0.0):
+        monkeypatch.setattr(coordinator_module.time, "time", lambda: now)
+        monkeypatch.setattr(coordinator_module.random, "uniform", lambda low, high: offset)
+        return coordinator._next_refresh_interval(interval).total_seconds()
+
+    seconds = interval.total_seconds()
+    start = 1_800_000_000.0
+    slots = set()
+    for step in range(50):
+        now = start + step * seconds / 17
+        assert delay(coordinators[0], now) == delay(coordinators[1], now)
+        slots.add(round((now + delay(coordinators[0], now)) % seconds, 3))
+
+        for offset in (-jitter.total_seconds(), 0.0, jitter.total_seconds()):
+            assert (
+                seconds / 2 - jitter.total_seconds()
+                <= delay(coordinators[2], now, offset)
+                <= seconds * 1.5 + jitter.total_seconds()
+            )
+
+    # Always the same slot in the interval, whenever the refresh happens
+    assert len(slots) == 1
+    assert round((start + delay(coordinators[2], start)) % seconds, 3) not in slots
+
+    # The jitter never exceeds a quarter of a short interval
+    bounds = []
+    monkeypatch.setattr(
+        coordinator_module.random, "uniform", lambda low, high: bounds.append((low, high)) or 0.0
+    )
+    coordinators[0]._next_refresh_interval(timedelta(minutes=20))
+    coordinators[0]._next_refresh_interval(interval)
+    assert bounds == [(-300.0, 300.0), (-jitter.total_seconds(), jitter.total_seconds())]
+
+
+if __name__ == "__main__":
+    test_restores_snapshot()
+    test_goes_stale_until_refreshed()
+    print("✓ coordinator tests passed")
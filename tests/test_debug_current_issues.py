@@ -99,11 +99,11 @@ async def test_service_alerts():
 
         print(f"\nService alert result:")
         if service_alert:
-            print(f"  alert_type: {service_alert.get('alert_type')}")
-            print(f"  has_delay: {service_alert.get('has_delay')}")
-            print(f"  delay_days: {service_alert.get('delay_days')}")
-            print(f"  week_of: {service_alert.get('week_of')}")
-            print(f"  text: {service_alert.get('text')}")
+            print(f"  alert_type: {service_alert.alert_type}")
+            print(f"  has_delay: {service_alert.has_delay}")
+            print(f"  delay_days: {service_alert.delay_days}")
+            print(f"  week_of: {service_alert.week_of}")
+            print(f"  text: {service_alert.text}")
         else:
             print("  No service alert found")
 
@@ -161,12 +161,12 @@ async def test_pickup_calculation():
         # Apply service alert delays
         if service_alert:
             print(f"\nService alert found:")
-            print(f"  has_delay: {service_alert.get('has_delay')}")
-            print(f"  delay_days: {service_alert.get('delay_days')}")
-            print(f"  week_of: {service_alert.get('week_of')}")
+            print(f"  has_delay: {service_alert.has_delay}")
+            print(f"  delay_days: {service_alert.delay_days}")
+            print(f"  week_of: {service_alert.week_of}")
 
-            if service_alert.get("has_delay"):
-                delay_days = service_alert.get("delay_days", 0)
+            if service_alert.has_delay:
+                delay_days = service_alert.delay_days
                 if delay_days > 0:
                     next_pickup += timedelta(days=delay_days)
                     print(f"  Applied {delay_days} day delay")
@@ -0,0 +1,175 @@
+"""Test entity state writes and the calendar's event cache."""
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke.calendar import RumpkePickupCalendar
+from custom_components.rumpke.coordinator import PickupTimelineMixin
+from custom_components.rumpke.fleet import FleetAddress
+from custom_components.rumpke.sensor import RumpkeLastUpdateSensor, RumpkeNextPickupSensor
+
+ENTRY = SimpleNamespace(entry_id="abc", title="Home", data={"zip_code": "45202"})
+
+
+class FakeCoordinator(PickupTimelineMixin):
+    """Serves the pickup timeline for data set by the test."""
+
+    zip_code = "45202"
+    service_day = "Thursday"
+    is_stale = False
+
+    def __init__(self):
+        self.data = _data(datetime(2026, 10, 1, 6, 0))
+        self.state_writes_suppressed = 0
+
+
+def _data(last_update, holidays=()):
+    """Return coordinator data."""
+    return {
+        "holidays": list(holidays),
+        "service_alert": None,
+        "alert_history": (),
+        "county": "Hamilton",
+        "state": "OH",
+        "last_update": last_update,
+    }
+
+
+def _added(entity):
+    """Record the entity's state as written, and count later writes."""
+    entity.writes = 0
+
+    def write():
+        entity.writes += 1
+
+    entity.async_write_ha_state = write
+    # What async_added_to_hass records, without a running Home Assistant
+    if isinstance(entity, RumpkeLastUpdateSensor):
+        entity._written = entity.native_value
+    elif isinstance(entity, RumpkePickupCalendar):
+        entity._written = (entity.available, entity.event)
+    else:
+        entity._written = (entity.available, entity.state, entity.extra_state_attributes)
+    return entity
+
+
+def test_unchanged_refresh_skips_writes():
+    """A refresh with the same pickups only writes the last update sensor."""
+    coordinator = FakeCoordinator()
+    sensor = _added(RumpkeNextPickupSensor(coordinator, ENTRY))
+    calendar = _added(RumpkePickupCalendar(coordinator, ENTRY))
+    last_update = _added(RumpkeLastUpdateSensor(coordinator, ENTRY))
+    entities = (sensor, calendar, last_update)
+
+    for entity in entities:
+        assert not entity.should_poll
+
+    # Same data pushed again, e.g. by an unchanged alerts update
+    for entity in entities:
+        entity._async_handle_coordinator_update()
+    assert [entity.writes for entity in entities] == [0, 0, 0]
+    assert coordinator.state_writes_suppressed == 3
+
+    # A new fetch of the same pickups
+    coordinator.data = _data(coordinator.data["last_update"] + timedelta(hours=36))
+    for entity in entities:
+        entity._async_handle_coordinator_update()
+    assert [entity.writes for entity in entities] == [0, 0, 1]
+
+    # Going stale changes availability
+    coordinator.is_stale = True
+    sensor._async_handle_coordinator_update()
+    calendar._async_handle_coordinator_update()
+    assert sensor.writes == calendar.writes == 1
+
+
+def test_fleet_counts_skipped_writes():
+    """A fleet's address entities count their skipped writes on the fleet."""
+    last_update = datetime(2026, 10, 1, 6, 0)
+    fleet = SimpleNamespace(
+        data={"addresses": {"office": _data(last_update)}, "last_update": last_update},
+        is_stale=False,
+        state_writes_suppressed=0,
+    )
+    address = FleetAddress(fleet, "45202", "Thursday", "Office")
+    entities = (
+        _added(RumpkeNextPickupSensor(address, ENTRY)),
+        _added(RumpkePickupCalendar(address, ENTRY)),
+        _added(RumpkeLastUpdateSensor(fleet, ENTRY)),
+    )
+
+    for entity in entities:
+        entity._async_handle_coordinator_update()
+    assert [entity.writes for entity in entities] == [0, 0, 0]
+    assert fleet.state_writes_suppressed == 3
+
+
+def _get_events(calendar, start, end):
+    """Return the calendar's events from start to end."""
+    midnight = datetime.min.time()
+    return asyncio.run(
+        calendar.async_get_events(
+            None, datetime.combine(start, midnight), datetime.combine(end, midnight)
+        )
+    )
+
+
+def test_event_cache_extends_and_drops():
+    """Only the uncovered dates are generated, until the data or date changes."""
+    coordinator = FakeCoordinator()
+    calendar = RumpkePickupCalendar(coordinator, ENTRY)
+    generated = []
+    generate = calendar._generate_events
+
+    def recording_generate(start, end):
+        generated.append((start, end))
+        return generate(start, end)
+
+    calendar._generate_events = recording_generate
+
+    def fresh(start, end):
+        return [event.start for event in generate(start, end)]
+
+    events = _get_events(calendar, date(2026, 10, 1), date(2026, 10, 31))
+    assert [event.start for event in events] == fresh(date(2026, 10, 1), date(2026, 10, 31))
+
+    # Extended left and right by only the missing dates, served from cache inside
+    events = _get_events(calendar, date(2026, 9, 15), date(2026, 10, 10))
+    assert [event.start for event in events] == fresh(date(2026, 9, 15), date(2026, 10, 10))
+    _get_events(calendar, date(2026, 10, 20), date(2026, 11, 15))
+    _get_events(calendar, date(2026, 10, 5), date(2026, 10, 6))
+    assert generated == [
+        (date(2026, 10, 1), date(2026, 10, 31)),
+        (date(2026, 9, 15), date(2026, 9, 30)),
+        (date(2026, 11, 1), date(2026, 11, 15)),
+    ]
+    assert calendar._events_range == (date(2026, 9, 15), date(2026, 11, 15))
+
+    # A range that doesn't touch the cached one replaces it
+    generated.clear()
+    _get_events(calendar, date(2027, 3, 1), date(2027, 3, 31))
+    assert generated == [(date(2027, 3, 1), date(2027, 3, 31))]
+    assert calendar._events_range == (date(2027, 3, 1), date(2027, 3, 31))
+
+    # New data drops the cache
+    generated.clear()
+    coordinator.data = _data(datetime(2026, 10, 2, 6, 0))
+    _get_events(calendar, date(2027, 3, 1), date(2027, 3, 31))
+    assert generated == [(date(2027, 3, 1), date(2027, 3, 31))]
+
+    # So does the date rolling over
+    generated.clear()
+    calendar._extend_events(date(2027, 3, 1), date(2027, 3, 31), date(2099, 1, 1))
+    assert generated == [(date(2027, 3, 1), date(2027, 3, 31))]
+
+
+if __name__ == "__main__":
+    test_unchanged_refresh_skips_writes()
+    test_fleet_counts_skipped_writes()
+    test_event_cache_extends_and_drops()
+    print("✓ entity tests passed")
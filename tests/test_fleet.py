@@ -0,0 +1,148 @@
+"""Test parsing a fleet's pasted address list, and refreshing a fleet."""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rumpke import config_flow
+from custom_components.rumpke.const import FLEET_MAX_ZIP_LOOKUPS
+from custom_components.rumpke.fleet import RumpkeFleetCoordinator, parse_addresses
+from custom_components.rumpke.region_cache import async_get_region_cache
+from custom_components.rumpke.snapshot import SnapshotStore
+from tests.test_region_schedules import _schedules
+
+
+def test_parse_addresses():
+    """A header and blank lines are skipped, labels default to the zip code."""
+    addresses = parse_addresses(
+        "zip_code,service_day,label\n45202, monday , Main Office\n\n45011,Friday\n"
+    )
+    assert addresses == [
+        {"zip_code": "45202", "service_day": "Monday", "label": "Main Office"},
+        {"zip_code": "45011", "service_day": "Friday", "label": "45011"},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    [
+        ("4520,Monday", "line 1: 4520 is not a zip code"),
+        ("45202,Monday\n45011,Someday", "line 2: Someday is not a day of the week"),
+        ("45202,Monday,Office\n45011,Friday,office", "line 2: office is listed more than once"),
+        ("45202", "line 1: expected zip code, service day and label"),
+        ("zip,day\n", "no addresses"),
+    ],
+)
+def test_parse_addresses_errors(text, error):
+    """The first bad line is named."""
+    with pytest.raises(ValueError, match=error):
+        parse_addresses(text)
+
+
+def test_validate_fleet_zips_limits_lookups(monkeypatch):
+    """Cached zips aren't looked up, and only so many new ones are."""
+    looked_up = []
+
+    class FakeApiClient:
+        def __init__(self, session, region_cache):
+            pass
+
+        async def get_region(self, zip_code):
+            looked_up.append(zip_code)
+            return {"region": "Cincinnati"} if zip_code != "45000" else None
+
+    monkeypatch.setattr(config_flow, "RumpkeApiClient", FakeApiClient)
+    new = [str(45000 + n) for n in range(FLEET_MAX_ZIP_LOOKUPS + 5)]
+
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        region_cache = await async_get_region_cache(hass)
+        region_cache.set("43215", {"region": "Columbus"})
+        region_cache.set("99999", None)
+        invalid = await config_flow.validate_fleet_zips(hass, ["43215", "99999", *new, *new])
+        await hass.async_stop(force=True)
+        return invalid
+
+    assert asyncio.run(run()) == ["45000", "99999"]
+    assert looked_up == new[:FLEET_MAX_ZIP_LOOKUPS]
+
+
+def test_varying_region_fetches_per_zip():
+    """Addresses in a region whose schedule varies by zip get their own zip's."""
+
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        schedules = await _schedules(hass, {"45011": "own page"})
+        # Checking 45011 against the region's schedule marks the region as varying
+        await schedules.async_get_holidays("45202")
+        await schedules.async_get_holidays("45011")
+        schedules.api.fetched.clear()
+
+        fleet = RumpkeFleetCoordinator(
+            hass,
+            parse_addresses("45202,Monday,Office\n45011,Friday,Depot"),
+            schedules,
+        )
+        await fleet.async_refresh()
+        await hass.async_stop(force=True)
+        return fleet, schedules
+
+    fleet, schedules = asyncio.run(run())
+    assert fleet.last_update_success
+    assert fleet.addresses["office"].data["holidays"] == [{"name": "region page"}]
+    assert fleet.addresses["depot"].data["holidays"] == [{"name": "own page"}]
+    assert sorted(schedules.api.fetched) == ["45011", "45202"]
+
+
+def test_restored_from_snapshot():
+    """A restarted fleet serves its last update without fetching anything."""
+    config_dir = tempfile.mkdtemp()
+    addresses = parse_addresses("45202,Monday,Office\n45011,Friday,Depot")
+
+    async def first_run():
+        hass = HomeAssistant(config_dir)
+        schedules = await _schedules(hass, {})
+        fleet = RumpkeFleetCoordinator(
+            hass, addresses, schedules, snapshot=SnapshotStore(hass, "fleet")
+        )
+        await fleet.async_refresh()
+        await fleet.async_shutdown()
+        # Writes the delayed snapshot save
+        await hass.async_stop(force=True)
+        return fleet.data
+
+    async def restart():
+        hass = HomeAssistant(config_dir)
+        schedules = await _schedules(hass, {})
+        fleet = RumpkeFleetCoordinator(
+            hass, addresses, schedules, snapshot=SnapshotStore(hass, "fleet")
+        )
+        restored = await fleet.async_restore_snapshot()
+        await fleet.async_shutdown()
+        await hass.async_stop(force=True)
+        return restored, fleet, schedules
+
+    data = asyncio.run(first_run())
+    restored, fleet, schedules = asyncio.run(restart())
+    assert restored
+    assert fleet.data["last_update"] == data["last_update"]
+    assert fleet.data["addresses"].keys() == data["addresses"].keys()
+    assert fleet.addresses["depot"].data["county"] == data["addresses"]["depot"]["county"]
+    assert not fleet.is_stale
+    assert fleet.addresses["depot"].timeline.next_pickup is not None
+    assert [holiday["name"] for holiday in fleet._holidays["45202"]] == ["region page"]
+    assert schedules.api.fetched == []
+
+
+if __name__ == "__main__":
+    test_parse_addresses()
+    test_varying_region_fetches_per_zip()
+    test_restored_from_snapshot()
+    print("✓ fleet tests passed")
@@ -12,7 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "rum
 
 from api import RumpkeApiClient
 from parser import HolidayScheduleParser
-from alerts_parser import ServiceAlertsParser
+from alerts_parser import ServiceAlert, ServiceAlertsParser
 from zipcode_lookup import get_county_from_zip
 
 # Test configuration - EXAMPLE DATA
@@ -22,7 +22,7 @@ TEST_SERVICE_DAY = "Monday"  # Example service day
 
 
 def calculate_next_pickup(
-    service_day: str, holidays: list, service_alert: dict | None
+    service_day: str, holidays: list, service_alert: ServiceAlert | None
 ) -> Optional[datetime.date]:
     """Calculate next pickup date considering holidays AND service alerts."""
     DAYS = {
@@ -51,12 +51,12 @@ def calculate_next_pickup(
     print(f"Next {service_day}: {next_pickup.strftime('%A, %B %d, %Y')}")
 
     # Apply service alert delays first
-    if service_alert and service_alert.get("has_delay"):
-        print(f"  ⚠️  SERVICE ALERT: {service_alert.get('alert_type')}")
-        print(f"     {service_alert.get('text', '')[:100]}...")
+    if service_alert and service_alert.has_delay:
+        print(f"  ⚠️  SERVICE ALERT: {service_alert.alert_type}")
+        print(f"     {service_alert.text[:100]}...")
 
-        if service_alert.get("delay_days"):
-            delay = service_alert["delay_days"]
+        if service_alert.delay_days:
+            delay = service_alert.delay_days
             next_pickup += timedelta(days=delay)
             print(f"  → Delayed {delay} day(s) due to alert: {next_pickup}")
 
@@ -77,7 +77,7 @@ def calculate_next_pickup(
             next_pickup += timedelta(days=1)
             print(f"  → Delayed by {holiday['name']} on {holiday_date}: {next_pickup}")
 
-    if not affected_holidays and not (service_alert and service_alert.get("has_delay")):
+    if not affected_holidays and not (service_alert and service_alert.has_delay):
         print("  ✓ No holidays or alerts affecting this pickup")
 
     return next_pickup
@@ -144,8 +144,8 @@ async def main():
             service_alert = ServiceAlertsParser.parse(alerts_html, county, state)
             if service_alert:
                 print(f"⚠️  ALERT FOUND for {county} County, {state}:")
-                print(f"   Type: {service_alert.get('alert_type')}")
-                print(f"   Text: {service_alert.get('text')}")
+                print(f"   Type: {service_alert.alert_type}")
+                print(f"   Text: {service_alert.text}")
             else:
                 print(f"✓ No active alerts for {county} County, {state}")
         else:
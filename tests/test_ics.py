@@ -0,0 +1,76 @@
+"""Test the iCalendar feeds."""
+import asyncio
+import sys
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant.components.http import KEY_HASS
+from homeassistant.util import dt as dt_util
+
+from custom_components.rumpke.ics import RumpkeIcsView, _escape, _fold
+from tests.test_entities import FakeCoordinator, _data
+
+
+def test_escape():
+    """Commas, semicolons, backslashes and newlines are escaped."""
+    assert _escape("Service day: Monday\nDelayed by: Labor Day, snow; ice\\") == (
+        "Service day: Monday\\nDelayed by: Labor Day\\, snow\\; ice\\\\"
+    )
+
+
+def test_fold():
+    """Long lines fold to 75 octets without splitting characters."""
+    assert _fold("SUMMARY:Rumpke Pickup") == "SUMMARY:Rumpke Pickup"
+
+    line = "DESCRIPTION:" + "é" * 100
+    folded = _fold(line)
+    parts = folded.split("\r\n")
+    assert all(len(part.encode()) <= 75 for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    assert "".join(part[1:] if i else part for i, part in enumerate(parts)) == line
+
+
+def test_feed_unchanged_by_refresh():
+    """A refresh with the same pickups keeps the feed's bytes and ETag."""
+    view = RumpkeIcsView()
+    coordinator = FakeCoordinator()
+    feed = view._feed("abc", coordinator)
+    events, etag = feed.events, feed.etag
+    assert b"DTSTAMP:" in events
+
+    coordinator.data = _data(coordinator.data["last_update"] + timedelta(hours=36))
+    feed = view._feed("abc", coordinator)
+    assert (feed.events, feed.etag) == (events, etag)
+
+    # A holiday moving a pickup changes it, Monday next week delays Thursday's
+    today = dt_util.now().date()
+    holiday = today + timedelta(days=7 - today.weekday())
+    coordinator.data = _data(
+        coordinator.data["last_update"],
+        [{"name": "Labor Day", "date": holiday, "has_delay": True}],
+    )
+    assert view._feed("abc", coordinator).etag != etag
+
+
+def test_removed_entry_feeds_are_dropped():
+    """Feeds of entries that are no longer loaded are forgotten."""
+    view = RumpkeIcsView()
+    view._feed("gone", FakeCoordinator())
+    hass = SimpleNamespace(data={})
+    request = SimpleNamespace(app={KEY_HASS: hass}, headers={})
+
+    response = asyncio.run(view.get(request, "gone"))
+    assert response.status == 404
+    assert view._feeds == {}
+
+
+if __name__ == "__main__":
+    test_escape()
+    test_fold()
+    test_feed_unchanged_by_refresh()
+    test_removed_entry_feeds_are_dropped()
+    print("✓ ICS tests passed")
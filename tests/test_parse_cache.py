@@ -0,0 +1,100 @@
+"""Test the content-hash parse cache."""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.rumpke.alerts_parser import ServiceAlertsParser
+from custom_components.rumpke.parse_cache import CODECS, ParseCache
+from custom_components.rumpke.parser import HolidayScheduleParser
+from tests.test_parser_engines import ALERTS_HTML, FETCHED, HOLIDAY_HTML
+
+
+def test_lru_eviction():
+    """The least recently used result is evicted past max_entries."""
+    cache = ParseCache(None, max_entries=2, persist=False)
+    cache._put(("holidays", "a"), ["a"])
+    cache._put(("holidays", "b"), ["b"])
+    assert cache.get("holidays", "a") == ["a"]
+    cache._put(("holidays", "c"), ["c"])
+
+    assert cache.get("holidays", "b") is None
+    assert cache.get("holidays", "a") == ["a"]
+    assert cache.get("holidays", "c") == ["c"]
+    assert cache.stats["hits"] == 3
+    assert cache.stats["evictions"] == 1
+
+
+def test_disk_codecs_round_trip():
+    """Parse results survive the trip through the disk tier."""
+    holidays = HolidayScheduleParser.parse(HOLIDAY_HTML)
+    encode, decode = CODECS["holidays"]
+    assert decode(encode(holidays)) == holidays
+
+    index = ServiceAlertsParser.parse_all(ALERTS_HTML, FETCHED)
+    encode, decode = CODECS["alerts"]
+    assert decode(encode(index)) == index
+
+
+def test_disk_tier_hit():
+    """A result only in the disk tier is decoded and promoted to memory."""
+    cache = ParseCache(None, persist=False)
+    holidays = HolidayScheduleParser.parse(HOLIDAY_HTML)
+    cache._disk["holidays:abc"] = CODECS["holidays"][0](holidays)
+
+    assert cache.get("holidays", "abc") == holidays
+    assert cache.stats["disk_hits"] == 1
+    assert cache.get("holidays", "abc") == holidays
+    assert cache.stats["hits"] == 1
+
+
+def test_cancelled_parse_fails_waiters():
+    """Cancelling the parsing caller doesn't leave others sharing it waiting."""
+    release = threading.Event()
+
+    def slow_parse(html):
+        release.wait(5)
+        return [html]
+
+    async def run():
+        hass = SimpleNamespace(
+            loop=asyncio.get_running_loop(),
+            data={},
+            bus=SimpleNamespace(async_listen_once=lambda *args: None),
+        )
+        cache = ParseCache(hass, persist=False)
+        parsing = asyncio.create_task(cache.async_parse("holidays", "abc", "page", slow_parse))
+        await asyncio.sleep(0.01)
+        waiting = asyncio.create_task(cache.async_parse("holidays", "abc", "page", slow_parse))
+        await asyncio.sleep(0.01)
+
+        parsing.cancel()
+        try:
+            async with asyncio.timeout(1):
+                await waiting
+            raise AssertionError("waiter got a result from a cancelled parse")
+        except HomeAssistantError:
+            pass
+        finally:
+            release.set()
+        assert parsing.cancelled()
+        assert not cache._parsing
+
+        # The next miss parses again
+        assert await cache.async_parse("holidays", "abc", "page", lambda html: [html]) == ["page"]
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_disk_codecs_round_trip()
+    test_disk_tier_hit()
+    test_cancelled_parse_fails_waiters()
+    print("✓ parse cache tests passed")
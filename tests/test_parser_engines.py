@@ -0,0 +1,108 @@
+"""Conformance and benchmark suite for the HTML parser engines."""
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke.alerts_parser import ServiceAlertsParser
+from custom_components.rumpke.parser import HolidayScheduleParser
+from custom_components.rumpke.parser_engines import DEFAULT_ENGINE, ENGINES, extract_sections
+
+FIXTURES = Path(__file__).parent / "fixtures"
+HOLIDAY_HTML = (FIXTURES / "holiday_schedule.html").read_text()
+ALERTS_HTML = (FIXTURES / "service_alerts.html").read_text()
+FETCHED = date(2026, 1, 20)
+
+# Markup the engines build different trees for if they get it wrong
+EDGE_CASES = {
+    "empty": "",
+    "whitespace": "  \n ",
+    "no sections": "<p>Nothing to see</p>",
+    "crlf": '<h3 class="tab">Ohio</h3>\r\n<div class="repeatable-content"><ul><li>Adams:\r\n one-day delay</li></ul></div>',
+    "script in item": '<h3>Ohio</h3><div class="repeatable-content"><li>Adams: <script>var x = "<li>A: b</li>";</script>delay</li></div>',
+    "comment in heading": '<h3>West <!-- x -->Virginia</h3><div class="repeatable-content"><li>Boone: ok</li></div>',
+    "section is text block": '<h3 class="tab">X</h3><div class="repeatable-content text"><div class="text"><h3>Y</h3><p>z</p></div></div>',
+    "nested sections": (
+        '<h3 class="tab">A</h3><div class="repeatable-content"><h3>B</h3>'
+        '<div class="repeatable-content"><div class="text"><p>inner</p></div><li>I: 1</li></div>'
+        '<div class="text"><p>outer</p></div></div>'
+    ),
+    "text block without heading": '<h3 class="tab">A</h3><div class="repeatable-content"><div class="text"><h3></h3><p> </p></div></div>',
+    "section before any h3": '<div class="repeatable-content"><li>A: b</li></div><h3>Ohio</h3>',
+}
+
+
+def test_default_engine():
+    """The fastest installed engine is the default, and bs4 is always available."""
+    assert "bs4" in ENGINES
+    assert DEFAULT_ENGINE == next(iter(ENGINES))
+
+
+def test_sections_match_bs4():
+    """Every engine extracts the same sections as bs4."""
+    for name, html in {"holidays": HOLIDAY_HTML, "alerts": ALERTS_HTML, **EDGE_CASES}.items():
+        expected = extract_sections(html, "bs4")
+        for engine in ENGINES:
+            assert extract_sections(html, engine) == expected, (engine, name)
+
+
+def test_holiday_records_match():
+    """Every engine produces identical holiday records."""
+    expected = HolidayScheduleParser.parse(HOLIDAY_HTML, "bs4")
+    assert len(expected) == 12
+    assert expected[0]["name"] == "New Year's Day"
+    assert expected[0]["date"] == date(2026, 1, 1)
+    assert expected[5]["date"] == date(2026, 9, 7)
+    assert expected[-1]["date"] is None
+    for engine in ENGINES:
+        assert HolidayScheduleParser.parse(HOLIDAY_HTML, engine) == expected, engine
+
+
+def test_alert_records_match():
+    """Every engine produces identical alert records."""
+    expected = ServiceAlertsParser.parse_all(ALERTS_HTML, FETCHED, "bs4")
+    assert ("WV", "boone") in expected
+    assert ("KY", "boone") in expected
+    assert all(county != "fake" for _, county in expected)
+    for engine in ENGINES:
+        assert ServiceAlertsParser.parse_all(ALERTS_HTML, FETCHED, engine) == expected, engine
+
+
+def test_falls_back_to_bs4():
+    """A failing engine falls back to bs4 instead of losing the page."""
+    def broken(html):
+        raise ValueError("boom")
+
+    ENGINES["broken"] = broken
+    try:
+        assert extract_sections(HOLIDAY_HTML, "broken") == extract_sections(HOLIDAY_HTML, "bs4")
+    finally:
+        del ENGINES["broken"]
+
+
+def benchmark(rounds: int = 20):
+    """Time each engine on the saved pages."""
+    for page, html, parse in (
+        ("holiday schedule", HOLIDAY_HTML, lambda html, engine: HolidayScheduleParser.parse(html, engine)),
+        ("service alerts", ALERTS_HTML, lambda html, engine: ServiceAlertsParser.parse_all(html, FETCHED, engine)),
+    ):
+        print(f"{page} ({len(html) // 1024} KB):")
+        for engine in ENGINES:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                parse(html, engine)
+            per_parse = (time.perf_counter() - start) / rounds
+            print(f"  {engine:<11} {per_parse * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    test_default_engine()
+    test_sections_match_bs4()
+    test_holiday_records_match()
+    test_alert_records_match()
+    test_falls_back_to_bs4()
+    print(f"✓ parser engine tests passed ({', '.join(ENGINES)})")
+    benchmark()
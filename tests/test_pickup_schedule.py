@@ -0,0 +1,196 @@
+"""Test and benchmark pickup schedule generation with the delay index."""
+import random
+import sys
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from itertools import takewhile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke.alerts_parser import ServiceAlert, ServiceAlertsParser
+from custom_components.rumpke.timeline import build_timeline, iter_pickups
+from custom_components.rumpke.utils import DAYS, DelayIndex, calculate_next_pickup, generate_pickup_dates
+
+START = date(2026, 1, 1)
+
+
+def linear_resolve(pickup_date: date, holidays: list, service_alert: ServiceAlert | None) -> date:
+    """Reference implementation: scan every holiday for every pickup."""
+    if service_alert and service_alert.has_delay:
+        if service_alert.week_of is None or (
+            service_alert.week_start is not None
+            and service_alert.week_start <= pickup_date <= service_alert.week_end
+        ):
+            pickup_date += timedelta(days=service_alert.delay_days)
+
+    week_start = pickup_date - timedelta(days=pickup_date.weekday())
+    week_end = week_start + timedelta(days=6)
+    for holiday in holidays:
+        if not holiday.get("has_delay") or not holiday.get("date"):
+            continue
+        if week_start <= holiday["date"] <= week_end and holiday["date"] <= pickup_date:
+            pickup_date += timedelta(days=1)
+    return pickup_date
+
+
+def linear_pickup_dates(service_day, holidays, service_alert, start_date, end_date):
+    """Reference implementation of generate_pickup_dates."""
+    service_weekday = DAYS[service_day]
+    scheduled = start_date + timedelta(days=service_weekday - start_date.weekday())
+    dates = []
+    while scheduled <= end_date:
+        pickup = linear_resolve(scheduled, holidays, service_alert)
+        if start_date <= pickup <= end_date:
+            dates.append(pickup)
+        scheduled += timedelta(weeks=1)
+    return dates
+
+
+def make_holidays(years: int) -> list:
+    """Eleven delaying holidays a year, like a real schedule page."""
+    holidays = []
+    for year in range(START.year, START.year + years):
+        for month, day in [(1, 1), (1, 19), (2, 16), (5, 25), (7, 4), (9, 7),
+                           (10, 12), (11, 11), (11, 26), (12, 24), (12, 25)]:
+            holidays.append({"name": f"{month}/{day}", "date": date(year, month, day), "has_delay": True})
+    return holidays
+
+
+ALERT = ServiceAlertsParser._parse_alert_text(
+    "Hamilton: One-day delay for the week of Jan. 26 due to snow.", START
+)
+
+
+def test_matches_linear_scan():
+    """The indexed schedule matches a linear scan for random inputs."""
+    rng = random.Random(1)
+    for _ in range(500):
+        service_day = rng.choice(list(DAYS))
+        holidays = [
+            {"name": str(i), "date": START + timedelta(days=rng.randint(-30, 800)), "has_delay": rng.random() > 0.3}
+            for i in range(rng.randint(0, 12))
+        ]
+        alert = rng.choice([
+            None,
+            ALERT,
+            replace(ALERT, delay_days=2, week_start=date(2026, 2, 2), week_end=date(2026, 2, 8)),
+            replace(ALERT, week_of=None),
+            replace(ALERT, week_start=None, week_end=None),
+        ])
+        start = START + timedelta(days=rng.randint(-20, 400))
+        end = start + timedelta(days=rng.randint(0, 200))
+
+        expected = linear_pickup_dates(service_day, holidays, alert, start, end)
+        assert generate_pickup_dates(service_day, holidays, alert, start, end) == expected
+        if expected:
+            assert calculate_next_pickup(service_day, holidays, alert, start) == expected[0]
+
+
+def test_holiday_delay_reasons():
+    """DelayIndex reports which holidays moved a pickup."""
+    holidays = [{"name": "New Year's Day", "date": date(2026, 1, 1), "has_delay": True}]
+    pickup, reasons = DelayIndex(holidays).resolve(date(2026, 1, 2))
+    assert pickup == date(2026, 1, 3)
+    assert reasons == ["New Year's Day"]
+
+
+def test_alert_week_resolved_once():
+    """Alert weeks resolve to one date range, inferring the year from the fetch date."""
+    assert (ALERT.week_start, ALERT.week_end) == (date(2026, 1, 26), date(2026, 2, 1))
+
+    late_december = ServiceAlertsParser._parse_alert_text(
+        "Boone: One-day delay for the week of Dec. 29.", date(2027, 1, 2)
+    )
+    assert late_december.week_start == date(2026, 12, 28)
+
+    # The delay applies to that week only, not the same week every year
+    index = DelayIndex([], ALERT)
+    assert index.resolve(date(2026, 1, 29))[0] == date(2026, 1, 30)
+    assert index.resolve(date(2027, 1, 28))[0] == date(2027, 1, 28)
+
+
+def window(service_day, delay_index, start, end):
+    """Return the pickups from start to end, generated lazily."""
+    return list(takewhile(lambda pickup: pickup.date <= end, iter_pickups(service_day, delay_index, start)))
+
+
+def test_lazy_pickups_match_timeline():
+    """Any window of the lazy stream matches a timeline built for it."""
+    rng = random.Random(2)
+    holidays = make_holidays(3)
+    index = DelayIndex(holidays, ALERT)
+    for _ in range(200):
+        service_day = rng.choice(list(DAYS))
+        start = START + timedelta(days=rng.randint(-400, 1000))
+        days = rng.randint(0, 400)
+        expected = build_timeline(service_day, holidays, ALERT, start, days).pickups
+        assert tuple(window(service_day, index, start, start + timedelta(days=days))) == expected
+        assert [pickup.date for pickup in expected] == linear_pickup_dates(
+            service_day, holidays, ALERT, start, start + timedelta(days=days)
+        )
+
+
+def test_alert_history_delays_past_weeks():
+    """Stored alerts delay their own week's pickups, and no others."""
+    past = replace(ALERT, delay_days=2, week_start=date(2025, 12, 1), week_end=date(2025, 12, 7))
+    index = DelayIndex([], ALERT, [past])
+    pickups = window("Tuesday", index, date(2025, 11, 24), date(2025, 12, 16))
+    assert [pickup.date for pickup in pickups] == [
+        date(2025, 11, 25), date(2025, 12, 4), date(2025, 12, 9), date(2025, 12, 16)
+    ]
+    assert pickups[1].reasons == ("Service alert: one_day_delay",)
+
+    # The current alert still applies to its own week
+    assert index.resolve(date(2026, 1, 27))[0] == date(2026, 1, 28)
+
+
+def benchmark_windows(repeats: int = 200):
+    """Time lazy generation per pickup for short and long windows, near and far."""
+    index = DelayIndex(make_holidays(10), ALERT)
+    print("Lazy pickup windows (per pickup):")
+    for label, start, days in [
+        ("1 week", START, 7),
+        ("2 years", START, 730),
+        ("1 week, 8 years out", START + timedelta(days=2920), 7),
+        ("1 week, 2 years back", START - timedelta(days=730), 7),
+    ]:
+        end = start + timedelta(days=days)
+        count = 0
+        began = time.perf_counter()
+        for _ in range(repeats):
+            count += len(window("Thursday", index, start, end))
+        elapsed = time.perf_counter() - began
+        print(f"  {label:22} {elapsed / count * 1e6:6.2f} us ({count // repeats} pickups)")
+
+
+def benchmark(years: int = 5):
+    """Time a multi-year schedule with the index against the linear scan."""
+    holidays = make_holidays(years)
+    end = START + timedelta(days=365 * years)
+
+    start = time.perf_counter()
+    indexed = generate_pickup_dates("Thursday", holidays, ALERT, START, end)
+    indexed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear = linear_pickup_dates("Thursday", holidays, ALERT, START, end)
+    linear_time = time.perf_counter() - start
+
+    assert indexed == linear
+    print(f"{years}-year horizon: {len(indexed)} pickups, {len(holidays)} holidays")
+    print(f"  delay index: {indexed_time * 1000:8.2f} ms")
+    print(f"  linear scan: {linear_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    test_matches_linear_scan()
+    test_holiday_delay_reasons()
+    test_alert_week_resolved_once()
+    test_lazy_pickups_match_timeline()
+    test_alert_history_delays_past_weeks()
+    print("✓ pickup schedule tests passed")
+    benchmark()
+    benchmark_windows()
@@ -0,0 +1,91 @@
+"""Test the rate limiter shared by all requests to Rumpke."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke.api import RateLimiter, timeout_excluding_queue
+
+
+def test_burst_then_rate():
+    """A burst goes straight through, then requests are spaced by the rate."""
+    limiter = RateLimiter(rate=20, burst=3, max_concurrent=10)
+    sent = []
+
+    async def request():
+        async with limiter.slot():
+            sent.append(time.monotonic())
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(request() for _ in range(7)))
+        return start
+
+    start = asyncio.run(run())
+    # 3 from the burst, then 4 more at 20 per second
+    assert sent[2] - start < 0.05
+    assert sent[-1] - start >= 4 / 20 - 0.02
+    assert limiter.stats["requests"] == 7
+    assert limiter.stats["delayed"] == 4
+    assert limiter.stats["max_queue_depth"] == 4
+    assert limiter.queued == 0
+
+
+def test_concurrency_cap_is_fair():
+    """At most max_concurrent run at once, in arrival order."""
+    limiter = RateLimiter(rate=1000, burst=100, max_concurrent=2)
+    running = 0
+    peak = 0
+    order = []
+
+    async def request(i):
+        nonlocal running, peak
+        async with limiter.slot():
+            order.append(i)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def run():
+        await asyncio.gather(*(request(i) for i in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert order == list(range(6))
+    assert limiter.as_dict()["average_wait"] > 0
+
+
+def test_timeout_excludes_queue_wait():
+    """Waiting in the queue doesn't count towards a timeout, the request itself does."""
+    limiter = RateLimiter(rate=20, burst=1, max_concurrent=10)
+
+    async def request(duration=0.0):
+        async with timeout_excluding_queue(0.1):
+            async with limiter.slot():
+                await asyncio.sleep(duration)
+        return True
+
+    async def run():
+        # The last waits 0.25s for its turn, well past its timeout
+        assert all(await asyncio.gather(*(request() for _ in range(6))))
+
+        try:
+            await request(0.2)
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("a slow request didn't time out")
+
+    asyncio.run(run())
+    assert limiter.stats["max_wait"] > 0.1
+
+
+if __name__ == "__main__":
+    test_burst_then_rate()
+    test_concurrency_cap_is_fair()
+    test_timeout_excludes_queue_wait()
+    print("✓ rate limiter tests passed")
@@ -0,0 +1,120 @@
+"""Test holiday schedules shared by the zips in a region."""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rumpke.api import FetchResult
+from custom_components.rumpke.region_cache import RegionCache
+from custom_components.rumpke.region_schedules import RegionSchedules
+
+REGIONS = {"45202": "Cincinnati", "45011": "Cincinnati", "45013": "Cincinnati"}
+
+
+class FakeApi:
+    """Serves a schedule page per zip, recording which zips were fetched."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    async def get_region(self, zip_code):
+        return {"region": REGIONS[zip_code]}
+
+    async def fetch_holiday_schedule(self, zip_code, conditional=True):
+        self.fetched.append(zip_code)
+        page = self.pages.get(zip_code, "region page")
+        return FetchResult(page, page, True)
+
+
+class FakeSession:
+    """Stands in for the aiohttp session the real API client would use."""
+
+
+class FakeParseCache:
+    """Parses a page to one holiday named after it."""
+
+    async def async_parse(self, kind, content_hash, html, parse):
+        return [{"name": html}]
+
+
+async def _schedules(hass, pages):
+    """Return region schedules over a fake API and a real region cache."""
+    region_cache = RegionCache(hass)
+    await region_cache.async_load()
+    schedules = RegionSchedules(hass, FakeSession(), region_cache, FakeParseCache())
+    schedules.api = FakeApi(pages)
+    return schedules
+
+
+def test_region_shared_and_verified():
+    """A region is fetched once, and each other zip once more to check it."""
+
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        schedules = await _schedules(hass, {})
+        for _ in range(2):
+            for zip_code in REGIONS:
+                assert await schedules.async_get_holidays(zip_code) == [{"name": "region page"}]
+        await hass.async_stop(force=True)
+        return schedules
+
+    schedules = asyncio.run(run())
+    assert schedules.api.fetched == ["45202", "45011", "45013"]
+    assert schedules.stats["verified"] == 2
+    assert schedules.stats["varying_regions"] == 0
+
+
+def test_varying_region_fetches_per_zip():
+    """Once a zip gets a different schedule, the region's zips fetch their own."""
+
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp())
+        schedules = await _schedules(hass, {"45011": "own page"})
+        assert await schedules.async_get_holidays("45202") == [{"name": "region page"}]
+        assert await schedules.async_get_holidays("45011") == [{"name": "own page"}]
+        assert await schedules.async_get_holidays("45013") is None
+        assert await schedules.async_get_holidays("45202", verify=False) is None
+        await hass.async_stop(force=True)
+        return schedules
+
+    schedules = asyncio.run(run())
+    assert schedules.stats["varying_regions"] == 1
+
+
+def test_sharing_survives_restart():
+    """Verified zips and varying regions are kept in the region cache's storage."""
+    config_dir = tempfile.mkdtemp()
+
+    async def first_run():
+        hass = HomeAssistant(config_dir)
+        schedules = await _schedules(hass, {})
+        for zip_code in ("45202", "45011"):
+            await schedules.async_get_holidays(zip_code)
+        await hass.async_stop(force=True)
+
+    async def restart():
+        hass = HomeAssistant(config_dir)
+        schedules = await _schedules(hass, {})
+        for zip_code in ("45011", "45202", "45013"):
+            await schedules.async_get_holidays(zip_code)
+        await hass.async_stop(force=True)
+        return schedules
+
+    asyncio.run(first_run())
+    schedules = asyncio.run(restart())
+    # One shared fetch, with a zip checked before the restart, and only the new zip checked
+    assert schedules.api.fetched == ["45202", "45013"]
+    assert schedules.stats["verified"] == 1
+
+
+if __name__ == "__main__":
+    test_region_shared_and_verified()
+    test_varying_region_fetches_per_zip()
+    test_sharing_survives_restart()
+    print("✓ region schedules tests passed")
@@ -0,0 +1,97 @@
+"""Test and benchmark the prebuilt zip index against the zipcodes package."""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.rumpke.utils import _load_zip_index, get_city_from_zip, get_county_from_zip, lookup_zip
+
+# Example zip codes across the Rumpke service area
+TEST_ZIPS = {
+    "45202": ("Hamilton", "Cincinnati", "OH"),
+    "43065": ("Delaware", "Powell", "OH"),
+    "40324": ("Scott", "Georgetown", "KY"),
+    "47025": ("Dearborn", "Lawrenceburg", "IN"),
+}
+
+
+def test_lookup_zip():
+    """Known zips resolve to county, city and state in one call."""
+    for zip_code, expected in TEST_ZIPS.items():
+        info = lookup_zip(zip_code)
+        assert info is not None, zip_code
+        assert (info.county, info.city, info.state) == expected
+
+
+def test_legacy_helpers():
+    """get_county_from_zip / get_city_from_zip keep their return shape."""
+    assert get_county_from_zip("45202") == ("Hamilton", "OH")
+    assert get_city_from_zip("45202") == ("Cincinnati", "OH")
+
+
+def test_unknown_zip():
+    """Zips outside the Rumpke states are not found."""
+    assert lookup_zip("90210") is None
+    assert get_county_from_zip("90210") is None
+
+
+def test_matches_zipcodes_package():
+    """Every indexed zip agrees with zipcodes.matching, when it is installed."""
+    try:
+        import zipcodes
+    except ImportError:
+        print("zipcodes not installed, skipping comparison")
+        return
+
+    for zip_code, info in _load_zip_index().items():
+        result = zipcodes.matching(zip_code)[0]
+        assert result["county"].replace(" County", "") == info.county, zip_code
+        assert result["city"] == info.city, zip_code
+        assert result["state"] == info.state, zip_code
+
+
+def benchmark(rounds: int = 1000):
+    """Compare lookup cost with the zipcodes.matching path it replaces."""
+    zips = list(TEST_ZIPS)
+
+    _load_zip_index.cache_clear()
+    start = time.perf_counter()
+    lookup_zip(zips[0])
+    print(f"zip index first lookup (load):   {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for zip_code in zips:
+            lookup_zip(zip_code)
+    per_call = (time.perf_counter() - start) / (rounds * len(zips))
+    print(f"zip index lookup:                {per_call * 1e6:8.2f} us")
+
+    start = time.perf_counter()
+    try:
+        import zipcodes
+    except ImportError:
+        print("zipcodes not installed, skipping comparison")
+        return
+    zipcodes.matching(zips[0])
+    print(f"zipcodes import + first matching: {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+    # The config flow used to make two of these per zip
+    start = time.perf_counter()
+    for _ in range(rounds // 10):
+        for zip_code in zips:
+            zipcodes.matching(zip_code)
+            zipcodes.matching(zip_code)
+    per_call = (time.perf_counter() - start) / (rounds // 10 * len(zips))
+    print(f"zipcodes.matching x2:            {per_call * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    test_lookup_zip()
+    test_legacy_helpers()
+    test_unknown_zip()
+    print("✓ zip index tests passed")
+    benchmark()
+    test_matches_zipcodes_package()
+    print("✓ zip index matches zipcodes package")